@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from string import Template
+
+
+_ANSI = re.compile(r"\033\[[0-9;]*m")
+# generated parts of a prompt: "[default]" values and quoted names
+_PROMPT_VALUES = re.compile(r"\[.*\]|'[^']*'")
+
+
+def _prompt_key(prompt: str) -> str:
+    """A prompt without colors, defaults and quoted values, for comparing."""
+    return " ".join(_PROMPT_VALUES.sub("", _ANSI.sub("", prompt)).split())
+
+
+class AnswerFileError(EOFError):
+    pass
+
+
+class AnswerRecorder:
+    """
+    Answer prompts from the terminal and keep a transcript of the session.
+
+    The transcript is written as YAML: the answers given before
+    `end_setup()` go to `setup`, the rest to `answers`, each as a
+    `{prompt, answer}` mapping. '$' is escaped as '$$', so the file can be
+    turned into a template by replacing recorded values with
+    `$placeholders` (see AnswerReplayer).
+    """
+
+    echo = True
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        self._setup: list[dict[str, str]] = []
+        self._answers: list[dict[str, str]] = []
+        self._current = self._setup
+
+    def ask(self, prompt: str = "") -> str:
+        answer = input(prompt)
+        self._current.append({
+            "prompt": _ANSI.sub("", prompt),
+            "answer": answer.replace("$", "$$"),
+        })
+        return answer
+
+    def end_setup(self) -> None:
+        self._current = self._answers
+
+    def save(self) -> None:
+        import yaml
+
+        with self._path.open("w", encoding="utf-8") as f:
+            yaml.safe_dump(
+                {"setup": self._setup, "answers": self._answers},
+                f,
+                sort_keys=False,
+                default_flow_style=False,
+                allow_unicode=True,
+                width=80,
+            )
+
+
+class AnswerReplayer:
+    """
+    Answer prompts from a recorded (or hand written) answer file.
+
+    Answers are handed out in order. Where the file recorded the prompt,
+    it must match the one asked (colors, `[defaults]` and quoted values
+    aside), else AnswerFileError tells which answer went out of step;
+    hand written files without prompts are replayed by position only.
+    The `setup` answers are used once,
+    then with `params` (one mapping per device) the `answers` are replayed
+    once per mapping, substituting `$name`/`${name}` placeholders. Once
+    all answers are used up a single empty answer ends the session,
+    asking again raises AnswerFileError.
+    """
+
+    echo = False
+
+    def __init__(
+        self,
+        answers: list[str],
+        params: list[dict] | None = None,
+        setup: list[str] | None = None,
+        prompts: list[str | None] | None = None,
+        setup_prompts: list[str | None] | None = None,
+    ) -> None:
+        setup = setup or []
+        prompts = list(prompts or [None] * len(answers))
+        # the recorded session ends with the empty answer that finished it
+        if answers and answers[-1] == "":
+            answers = answers[:-1]
+            prompts = prompts[:len(answers)]
+        self._setup = [
+            (p, Template(a))
+            for p, a in zip(setup_prompts or [None] * len(setup), setup)
+        ]
+        self._templates = [(p, Template(a)) for p, a in zip(prompts, answers)]
+        self._params = params if params is not None else [{}]
+        self._answers = self._iter_answers()
+        self._finished = False
+        self.count = 0
+
+    @classmethod
+    def from_file(cls, path: Path, params_path: Path | None = None) -> "AnswerReplayer":
+        import yaml
+
+        with Path(path).open("r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        sections = {}
+        prompts = {}
+        for section in ("setup", "answers"):
+            sections[section] = []
+            prompts[section] = []
+            for a in data.get(section, []) or []:
+                p = a.get("prompt") if isinstance(a, dict) else None
+                a = a.get("answer", "") if isinstance(a, dict) else a
+                sections[section].append("" if a is None else str(a))
+                prompts[section].append(None if p is None else str(p))
+        params = load_params(Path(params_path)) if params_path else None
+        return cls(
+            sections["answers"], params, sections["setup"],
+            prompts["answers"], prompts["setup"],
+        )
+
+    def end_setup(self) -> None:
+        pass
+
+    def ask(self, prompt: str = "") -> str:
+        try:
+            recorded, answer = next(self._answers)
+        except StopIteration:
+            if self._finished:
+                raise AnswerFileError(
+                    f"Answer file exhausted after {self.count} answers " + \
+                    f"(prompt: '{_ANSI.sub('', prompt).strip()}')"
+                ) from None
+            self._finished = True
+            return ""
+        if recorded is not None and _prompt_key(recorded) != _prompt_key(prompt):
+            raise AnswerFileError(
+                f"Answer {self.count + 1} was recorded for the prompt " + \
+                f"'{_ANSI.sub('', recorded).strip()}', but the prompt is " + \
+                f"'{_ANSI.sub('', prompt).strip()}'"
+            )
+        self.count += 1
+        return answer
+
+    def _iter_answers(self) -> Iterator[tuple[str | None, str]]:
+        for p, t in self._setup:
+            yield p, t.substitute({})
+        for i, row in enumerate(self._params):
+            row = {str(k): "" if v is None else str(v) for k, v in row.items()}
+            for p, t in self._templates:
+                try:
+                    yield p, t.substitute(row)
+                except (KeyError, ValueError) as e:
+                    raise AnswerFileError(
+                        f"Parameter set {i}: cannot fill '{t.template}': {e}"
+                    ) from None
+
+
+def load_params(path: Path) -> list[dict]:
+    """Parameter sets for a template: a CSV file with header, or a YAML list."""
+    if path.suffix == ".csv":
+        import csv
+
+        with path.open("r", encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+    import yaml
+
+    with path.open("r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or []
+    if not isinstance(data, list):
+        raise AnswerFileError(f"{path}: expected a list of parameter sets")
+    return data
@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 
 import json
-import yaml
-from jsonschema import Draft7Validator as Validator
 import os
 import sys
 
+# argparse, yaml, jsonschema and the schema store are heavy, they are
+# imported only once a code path actually needs them (see startup-benchmark.py)
+
 def load_data(filename):
     try:
         print("Trying JSON")
@@ -14,6 +15,7 @@ def load_data(filename):
 #            print(data)
             return data
     except json.decoder.JSONDecodeError:
+        import yaml
         try:
             print("Trying YAML")
             with open(filename, "r") as fh:
@@ -29,30 +31,51 @@ def load_data(filename):
         print(e)
         print("Could not read the imput file.")
 
-def test_json_schema(json_file, schema_file, meta_schema_file=""):
-    json_data = load_data(json_file)
+def test_json_schema(json_file, schema_file, meta_schema_file="", store=None):
+    test_json_schemas([json_file], schema_file, meta_schema_file, store)
+
+def test_json_schemas(json_files, schema_file, meta_schema_file="", store=None):
+    from jsonschema import Draft7Validator as Validator
+    from schema_store import SchemaStore
+
+    # one store, one compiled validator for the whole batch
+    if store is None:
+        store = SchemaStore()
     schema_data = load_data(schema_file)
     if meta_schema_file:
         meta_schema_data = load_data(meta_schema_file)
-        Validator(meta_schema_data).validate(schema_data)
+        store.validator_for(meta_schema_data, Validator).validate(schema_data)
         print("passed meta schema")
-    Validator(schema_data).validate(json_data)
-    print("passed schema")
+    validator = store.validator_for(schema_data, Validator)
+    for json_file in json_files:
+        json_data = load_data(json_file)
+        validator.validate(json_data)
+        print(f"passed schema: {json_file}")
 
 if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="This tool validates json/yaml against a schema hierarchy."
+    )
+    parser.add_argument("json", help="json/yaml data file")
+    parser.add_argument("schema", help="json/yaml schema file")
+    parser.add_argument("meta_schema", nargs="?", default="",
+        help="json/yaml meta-schema file")
+    parser.add_argument("-s", "--store", action="append", default=[],
+        help="local schema store (file or directory) all $refs resolve " + \
+        "against, indexed by $id (repeatable, no network access)")
+    parser.add_argument("-d", "--data", action="append", default=[],
+        help="further data files validated in the same batch (repeatable)")
+    args = parser.parse_args()
 
     try:
-        if len(sys.argv) <= 2:
-            print("This tool validates json/yaml against a schema hierarchy.")
-            sys.exit("Usage: json-schema-validator.py json schema [meta-schema]")
-        elif len(sys.argv) == 3:
-            test_json_schema(sys.argv[1], sys.argv[2])
-        elif len(sys.argv) == 4:
-            test_json_schema(sys.argv[1], sys.argv[2], sys.argv[3])
-        else:
-            sys.exit("please provide 2 or 3 args (json_file, schema, meta-schema")
+        from schema_store import SchemaStore
+        store = SchemaStore(args.store)
+        test_json_schemas(
+            [args.json] + args.data, args.schema, args.meta_schema, store
+        )
         print("Success - the file matches the schema hierarchy!")
     except Exception as e:
         print("Failed!")
         print(e)
-
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from itertools import count
+
+
+FIELDS = ("displayname", "description")
+LENGTHS = ("short", "long")
+
+
+class _Localized:
+    """Placeholder in a `meta` dict for a field rendered from the store."""
+
+    def __repr__(self) -> str:
+        return "LOCALIZED"
+
+
+LOCALIZED = _Localized()
+
+
+class LocalizedStrings:
+    """
+    Display names and descriptions of all Sources/SourceTypes in one table.
+
+    A node only holds an integer key. Per key the store keeps its base
+    language (the one that is always present, "en" unless reset) and the
+    non-empty texts by (field, length, lang) in the order they were set.
+    Texts and (field, length, lang) tuples are interned, so the repeated
+    "same as the sourcetype" texts of tens of thousands of nodes share
+    one string each.
+
+    `render` rebuilds the nested `{field: {length: {lang: text}}}` dict
+    with the same key order the old per-node dicts had.
+    """
+
+    def __init__(self) -> None:
+        self._keys = count()
+        self._strings: dict[str, str] = {}
+        self._slots: dict[tuple[str, str, str], tuple[str, str, str]] = {}
+        self._base: dict[int, str] = {}        # only where not "en"
+        self._texts: dict[int, dict[tuple[str, str, str], str]] = {}
+
+    def __len__(self) -> int:
+        """Number of distinct texts."""
+        return len(self._strings)
+
+    def new_key(self) -> int:
+        return next(self._keys)
+
+    def set(self, key: int, field: str, length: str, lang: str, text: str) -> None:
+        if not text:
+            return
+        slot = (field, length, lang)
+        slot = self._slots.setdefault(slot, slot)
+        texts = self._texts.get(key)
+        if texts is None:
+            texts = self._texts[key] = {}
+        texts[slot] = self._strings.setdefault(text, text)
+
+    def reset(self, key: int, lang: str = "en") -> None:
+        """Drop all texts of `key`, leaving only empty `lang` entries."""
+        self._texts.pop(key, None)
+        if lang == "en":
+            self._base.pop(key, None)
+        else:
+            self._base[key] = lang
+
+    def get(self, key: int, field: str, length: str, lang: str = "en", fallback: int | None = None) -> str:
+        """The text of `key`, else that of `fallback` (the sourcetype), else ""."""
+        for k in (key, fallback):
+            texts = self._texts.get(k) if k is not None else None
+            if texts and (field, length, lang) in texts:
+                return texts[(field, length, lang)]
+        return ""
+
+    def render(self, key: int, field: str) -> dict[str, dict[str, str]]:
+        base = self._base.get(key, "en")
+        out = {length: {base: ""} for length in LENGTHS}
+        for (f, length, lang), text in self._texts.get(key, {}).items():
+            if f == field:
+                out[length][lang] = text
+        return out
+
+
+def render_meta(meta: dict, key: int) -> dict:
+    """A copy of `meta` with the LOCALIZED placeholders filled in."""
+    return {
+        k: strings.render(key, k) if v is LOCALIZED else v
+        for k, v in meta.items()
+    }
+
+
+# --- tiny singleton helper ---
+
+strings = LocalizedStrings()
@@ -8,17 +8,21 @@
 #    baromrelin hPa float" | ./$0
 #
 
+# Keep startup cheap: this runs from provisioning hooks many times over,
+# so yaml, json, re and the units registry are only imported by the
+# code paths that need them (see startup-benchmark.py).
 import os
 import sys
-import uuid
-import yaml
-import json
-import re
 
-from units_registry_loader import get_units_registry
+from localized_strings import LOCALIZED, render_meta, strings
+from pipeline_profiler import profiler
 
 # Prepare tiny global singleton helper copy
 ucum_registry = None
+# Answer source for the prompts (AnswerRecorder/AnswerReplayer), see --record
+answer_source = None
+# Compiled schema validators by kind ("Source"/"SourceType"), see --schema
+source_validators = None
 
 # Define a new Class to be represented and ..
 class Quoted(str): pass
@@ -28,18 +32,58 @@ def q(s): return Quoted(str(s))
 # some font tweaks
 def supports_color():
     return os.isatty(sys.stdout.fileno())
-COLOR_RESET = "\033[0m" if supports_color() else ""
-COLOR_WHITE_BOLD = "\033[1;39m" if supports_color() else ""
-#COLOR_GREEN = "\033[32m" if supports_color() else ""
-COLOR_GREEN_BOLD = "\033[1;32m" if supports_color() else ""
-COLOR_YELLOW = "\033[33m" if supports_color() else ""
-COLOR_YELLOW_BOLD = "\033[1;33m" if supports_color() else ""
-#COLOR_RED = "\033[31m" if supports_color() else ""
-COLOR_RED_BOLD = "\033[1;31m" if supports_color() else ""
-COLOR_CYAN = "\033[36m" if supports_color() else ""
-COLOR_CYAN_BOLD = "\033[1;36m" if supports_color() else ""
-COLOR_MAGENTA = "\033[35m" if supports_color() else ""
-COLOR_MAGENTA_BOLD = "\033[1;35m" if supports_color() else ""
+_COLOR = supports_color()
+COLOR_RESET = "\033[0m" if _COLOR else ""
+COLOR_WHITE_BOLD = "\033[1;39m" if _COLOR else ""
+#COLOR_GREEN = "\033[32m" if _COLOR else ""
+COLOR_GREEN_BOLD = "\033[1;32m" if _COLOR else ""
+COLOR_YELLOW = "\033[33m" if _COLOR else ""
+COLOR_YELLOW_BOLD = "\033[1;33m" if _COLOR else ""
+#COLOR_RED = "\033[31m" if _COLOR else ""
+COLOR_RED_BOLD = "\033[1;31m" if _COLOR else ""
+COLOR_CYAN = "\033[36m" if _COLOR else ""
+COLOR_CYAN_BOLD = "\033[1;36m" if _COLOR else ""
+COLOR_MAGENTA = "\033[35m" if _COLOR else ""
+COLOR_MAGENTA_BOLD = "\033[1;35m" if _COLOR else ""
+
+# all prompts go through ask(), so they can be recorded and replayed
+def ask(prompt=""):
+    if answer_source is not None:
+        return answer_source.ask(prompt)
+    return input(prompt)
+
+def echoing():
+    return answer_source is None or answer_source.echo
+
+# interactive chatter, silent while replaying an answer file
+def say(*args, **kwargs):
+    if echoing():
+        print(*args, **kwargs)
+
+def new_uuid():
+    # uuid.uuid4() without `import uuid`, which drags in `platform`
+    b = bytearray(os.urandom(16))
+    b[6] = b[6] & 0x0F | 0x40
+    b[8] = b[8] & 0x3F | 0x80
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+class LazyUnitsRegistry():
+    """
+    Stands in for the units registry until the first lookup, so a run
+    that never looks up a unit neither loads the registry nor connects
+    to the daemon.
+    """
+    def __init__(self, path=None):
+        self._path = path
+        self._registry = None
+
+    def __getattr__(self, name):
+        if self._registry is None:
+            # a running units_registry_daemon.py serves the default registry warm
+            from units_registry_daemon import connect_units_registry
+            self._registry = connect_units_registry(self._path)
+        return getattr(self._registry, name)
 
 class SourceType():
     # Configurable indent prefix
@@ -57,30 +101,24 @@ class SourceType():
         self.datatype = None
         self.dataunit = None
         self.dataunitencoding = 'meta:quantity_kind'
+        # display names/descriptions live in localized_strings.strings
+        self.l10n_key = strings.new_key()
         self.meta = {
             'uncertainty': None,
             'quantity_kind': None,
-            'displayname': {
-                'short': {
-                    'en': ""
-                },
-                'long': {
-                    'en': ""
-                }
-            },
-            'description': {
-                'short': {
-                    'en': ""
-                },
-                'long': {
-                    'en': ""
-                }
-            },
+            'displayname': LOCALIZED,
+            'description': LOCALIZED,
         }
 
     def auto_fill(self):
         if not self.uuid:
-            self.uuid = str(uuid.uuid4())
+            self.uuid = new_uuid()
+
+    def displayname(self, length="short", lang="en"):
+        return strings.get(self.l10n_key, "displayname", length, lang)
+
+    def description(self, length="short", lang="en"):
+        return strings.get(self.l10n_key, "description", length, lang)
 
     def serialize_parameters(self):
         self.auto_fill()
@@ -92,9 +130,10 @@ class SourceType():
             "type": self.datatype,
             "unit": self.dataunit,
             "unitencoding": self.dataunitencoding,
-            "meta": self.meta,
+            "meta": render_meta(self.meta, self.l10n_key),
         }
-        return quote_textlike(o)
+        with profiler.stage("quote_textlike"):
+            return quote_textlike(o)
 
 
 
@@ -111,23 +150,10 @@ class Source():
         self.parentsource = parentsource
         self.sub_sources = []
 
+        self.l10n_key = strings.new_key()
         self.meta = {
-            'displayname': {
-                'short': {
-                    'en': ""
-                },
-                'long': {
-                    'en': ""
-                }
-            },
-            'description': {
-                'short': {
-                    'en': ""
-                },
-                'long': {
-                    'en': ""
-                }
-            },
+            'displayname': LOCALIZED,
+            'description': LOCALIZED,
         }
 
     def set_names(
@@ -170,53 +196,30 @@ class Source():
         lang="en",
     ):
         if disable_displaynames:
-            self.meta["displayname"] = {
-                'short': {
-                    lang: ""
-                }, 'long': {
-                    lang: ""
-                }
-            }
-            self.sourcetype.meta["displayname"] = {
-                'short': {
-                    lang: ""
-                }, 'long': {
-                    lang: ""
-                }
-            }
-            self.meta["description"] = {
-                'short': {
-                    lang: ""
-                }, 'long': {
-                    lang: ""
-                }
-            }
-            self.sourcetype.meta["description"] = {
-                'short': {
-                    lang: ""
-                }, 'long': {
-                    lang: ""
-                }
-            }
-        else:
-            if sourcetype_displaynameshort:
-                self.sourcetype.meta["displayname"]["short"][lang] = \
-                    sourcetype_displaynameshort
-            if sourcetype_displaynamelong:
-                self.sourcetype.meta["displayname"]["long"][lang] = \
-                    sourcetype_displaynamelong
-            if source_displaynameshort:
-                self.meta["displayname"]["short"][lang] = source_displaynameshort
-            if source_displaynamelong:
-                self.meta["displayname"]["long"][lang] = source_displaynamelong
-            if sourcetype_descriptionshort:
-                self.sourcetype.meta["description"]["short"][lang] = sourcetype_descriptionshort
-            if sourcetype_descriptionlong:
-                self.sourcetype.meta["description"]["long"][lang] = sourcetype_descriptionlong
-            if source_descriptionshort:
-                self.meta["description"]["short"][lang] = source_descriptionshort
-            if source_descriptionlong:
-                self.meta["description"]["long"][lang] = source_descriptionlong
+            strings.reset(self.l10n_key, lang)
+            strings.reset(self.sourcetype.l10n_key, lang)
+            return
+        st = self.sourcetype.l10n_key
+        strings.set(st, "displayname", "short", lang, sourcetype_displaynameshort)
+        strings.set(st, "displayname", "long", lang, sourcetype_displaynamelong)
+        strings.set(self.l10n_key, "displayname", "short", lang, source_displaynameshort)
+        strings.set(self.l10n_key, "displayname", "long", lang, source_displaynamelong)
+        strings.set(st, "description", "short", lang, sourcetype_descriptionshort)
+        strings.set(st, "description", "long", lang, sourcetype_descriptionlong)
+        strings.set(self.l10n_key, "description", "short", lang, source_descriptionshort)
+        strings.set(self.l10n_key, "description", "long", lang, source_descriptionlong)
+
+    def displayname(self, length="short", lang="en"):
+        """The display name, falling back to the one of the sourcetype."""
+        return strings.get(
+            self.l10n_key, "displayname", length, lang, self.sourcetype.l10n_key
+        )
+
+    def description(self, length="short", lang="en"):
+        """The description, falling back to the one of the sourcetype."""
+        return strings.get(
+            self.l10n_key, "description", length, lang, self.sourcetype.l10n_key
+        )
 
 
     def parturate(self):
@@ -230,7 +233,7 @@ class Source():
 
     def auto_fill(self):
         if not self.uuid:
-            self.uuid = str(uuid.uuid4())
+            self.uuid = new_uuid()
         if not self.sourcetype:
             raise Exception(f"ERROR: Source without SourceType: {self.uuid}")
         else:
@@ -245,9 +248,10 @@ class Source():
             "typeuuid": self.sourcetype.uuid if self.sourcetype else None,
             "parentuuid": self.parentsource.uuid if self.parentsource else None,
             "parentname": self.parentsource.name if self.parentsource else None,
-            "meta": self.meta,
+            "meta": render_meta(self.meta, self.l10n_key),
         }
-        return quote_textlike(o)
+        with profiler.stage("quote_textlike"):
+            return quote_textlike(o)
 
     def serialize_deep(self, container=None, depth=None):
         if depth == None:
@@ -269,11 +273,16 @@ class Source():
         ):
             raise Exception("Container corrupt.")
 
+        profiler.count("nodes.serialized")
         if self.uuid in container["sources"]:
             print("WARNING: Duplicate Source entry found, last one takes precedence: {self.uuid}")
-        container["sources"][self.uuid] = self.serialize_parameters()
+        container["sources"][self.uuid] = validate_serialized(
+            "Source", self.serialize_parameters()
+        )
         if not self.sourcetype.uuid in container["sourcetypes"]:
-            container["sourcetypes"][self.sourcetype.uuid] = self.sourcetype.serialize_parameters()
+            container["sourcetypes"][self.sourcetype.uuid] = validate_serialized(
+                "SourceType", self.sourcetype.serialize_parameters()
+            )
 
         for s in self.sub_sources:
             s.serialize_deep(container, depth)
@@ -281,30 +290,69 @@ class Source():
 
 
 
+def load_source_validators(schema_file, store_paths=None):
+    """
+    Compile the validators for serialized Sources/SourceTypes once.
+
+    If the schema defines 'Source' and 'SourceType' (in 'definitions' or
+    '$defs') each kind is validated against its own definition, otherwise
+    both are validated against the whole schema.
+    """
+    from pathlib import Path
+    from schema_store import SchemaStore, load_schema_file
+
+    store = SchemaStore(store_paths)
+    schema = load_schema_file(Path(schema_file))
+    validators = {}
+    for defs in ("definitions", "$defs"):
+        d = schema.get(defs, {}) if isinstance(schema, dict) else {}
+        if "Source" in d and "SourceType" in d:
+            for kind in ("Source", "SourceType"):
+                # draft-7 ignores siblings of '$ref', local refs keep working
+                validators[kind] = store.validator_for(
+                    dict(schema, **{"$ref": f"#/{defs}/{kind}"})
+                )
+            return validators
+    validator = store.validator_for(schema)
+    return {"Source": validator, "SourceType": validator}
+
+def validate_serialized(kind, o):
+    if source_validators:
+        error = next(source_validators[kind].iter_errors(o), None)
+        if error is not None:
+            path = "/".join(str(p) for p in error.absolute_path)
+            raise Exception(
+                f"ERROR: {kind} '{o.get('name')}' ({o.get('uuid')}) does " + \
+                f"not match the schema at '{path}': {error.message}"
+            )
+    return o
+
 def slugify(name: str) -> str:
+    import re
     return re.sub(r"[^A-Za-z0-9_-]", "_", name.strip().replace(" ", "_"))
 
 def search_ucum(query, type_query=None, limit=8):
     while True:
-        q = ucum_registry.lookup_quantity_kinds(query=query, limit=limit)
-        if len(q) < 1:
-            q = ucum_registry.lookup_quantity_kinds(query=type_query, limit=limit)
+        with profiler.stage("search_ucum"):
+            q = ucum_registry.lookup_quantity_kinds(query=query, limit=limit)
+            if len(q) < 1:
+                q = ucum_registry.lookup_quantity_kinds(query=type_query, limit=limit)
 
         u = 0 ; i = 0
         if len(q) > 0:
-            print("  One of the following quantity-kinds:units could match:")
+            say("  One of the following quantity-kinds:units could match:")
             for key, score in q:
                 qk = ucum_registry.quantity_kinds[key]
-                print(
+                say(
                     f"    {i}: {key} {qk.label} [{qk.symbol}] (unit={qk.default_unit}) " +
                     f"score={score}"
                 )
                 i += 1
-            r = input(f"Enter the index that fits best (or new search terms: ").strip()
+            r = ask(f"Enter the index that fits best (or new search terms: ").strip()
             try:
                 j = int(r)
                 if j > len(q):
-                    print(
+                    say(
                         f"There are only {len(q)} number of items to choose from... " +
                         "Please try again."
                     )
@@ -312,12 +360,28 @@ def search_ucum(query, type_query=None, limit=8):
                     qk = ucum_registry.quantity_kinds[q[j][0]]
                     return qk.__dict__
             except Exception as e:
-                print(e)
+                say(e)
                 query = r
         else:
-            query = input("No results found, please add new search terms: ").strip()
+            query = ask("No results found, please add new search terms: ").strip()
 
 
+def match_ucum(query, raw_unit, limit=8):
+    """Non-interactive search_ucum: best quantity kind compatible with the unit."""
+    unit_dim = ucum_registry.unit_dimension(raw_unit)
+    norm_unit = ucum_registry.normalize_unit(raw_unit)
+    # rank by the name only, the unit must not make up for a missing match
+    for key, score in ucum_registry.lookup_quantity_kinds(
+        query=query, limit=limit
+    ):
+        qk = ucum_registry.quantity_kinds[key]
+        if (
+            (norm_unit and norm_unit == qk.default_unit) or
+            (unit_dim and unit_dim == ucum_registry.unit_dimension(qk.default_unit))
+        ):
+            return qk.__dict__
+    return None
+
 # TODO parse_stdin() supports far less features than parse_interactive()..
 def parse_stdin():
     """Parse lines of form:
@@ -325,31 +389,121 @@ def parse_stdin():
        Index
           subname unit [type]
     """
-    the_source = Source()
+    the_source = Source(SourceType())
     lines = [l.rstrip() for l in sys.stdin if l.strip()]
     if not lines:
         return None
-    the_source.sourcetype.name = slugify(lines[0])
-    the_source.index = lines[1].strip() if len(lines) > 1 else the_source.index
+    the_source.set_names(
+        lines[0], lines[1].strip() if len(lines) > 1 else None
+    )
     for line in lines[2:]:
         parts = line.strip().split(None, 3)
         if not parts:
             continue
         sub_source = the_source.parturate()
-        sub_source.name = slugify(parts[0])
-        sub_source.sourcetype.dateunit = parts[1].strip() if len(parts) > 1 else ""
-        sub_source.sourcetype.datatype = parts[2].strip() if len(parts) > 2 else "float"
+        sub_source.set_names(
+            parts[0], None, True, SourceType.DEFAULT_SUB_TYPE
+        )
+        set_unit(
+            sub_source,
+            parts[0],
+            parts[1].strip() if len(parts) > 1 else "",
+            parts[2].strip() if len(parts) > 2 else "float",
+        )
     return the_source
 
+def set_unit(source, name, unit, datatype="float"):
+    source.sourcetype.dataunit = unit
+    source.sourcetype.datatype = datatype
+    if ucum_registry and unit:
+        # no prompt here: valid UCUM expressions are matched by dimension
+        source.sourcetype.dataunit = ucum_registry.normalize_unit(unit) or unit
+        qk = match_ucum(name, unit)
+        if qk:
+            source.sourcetype.meta["quantity_kind"] = qk
+            source.sourcetype.meta["uncertainty"] = {}
+
+def load_manifest(path):
+    """
+    Iterate over the stations of a fleet manifest, see maestro-fleet-synth.py:
+       stations:
+         - name: WittBoy_GW2000A    # every node: name, [index], [classname],
+           index: "0001"            #   [devicetype], [uuid], [typeuuid],
+           children:                #   [displayname], [description],
+             - name: temp_air       #   [type_displayname], [type_description],
+               unit: Cel            #   [meta], [children]
+               type: float          # channels: unit, [type]
+    Nodes sharing a typeuuid share one SourceType.
+    """
+    import yaml
+
+    with profiler.stage("load_manifest"):
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    stations = data.get("stations") if isinstance(data, dict) else data
+    if not isinstance(stations, list):
+        raise Exception(f"ERROR: {path}: expected a list of stations")
+    sourcetypes = {}
+    for station in stations:
+        with profiler.stage("parse_manifest"):
+            source = manifest_source(station, sourcetypes)
+        yield source
+
+def manifest_source(entry, sourcetypes, parent=None):
+    if not isinstance(entry, dict) or not entry.get("name"):
+        raise Exception(f"ERROR: manifest entry without a name: {entry!r:.60}")
+    typeuuid = entry.get("typeuuid")
+    sourcetype = sourcetypes.get(typeuuid) if typeuuid else None
+    if sourcetype is None:
+        sourcetype = SourceType()
+        sourcetype.uuid = typeuuid
+        if typeuuid:
+            sourcetypes[typeuuid] = sourcetype
+    source = Source(sourcetype)
+    if parent is not None:
+        parent.adopt(source)
+    source.uuid = entry.get("uuid")
+
+    children = entry.get("children") or []
+    index = entry.get("index")
+    source.set_names(
+        entry["name"],
+        str(index) if index is not None else None,
+        parent is not None and index is None,
+        entry.get("classname") or (
+            SourceType.DEFAULT_SUPER_TYPE if children or parent is None
+            else SourceType.DEFAULT_SUB_TYPE
+        ),
+        entry.get("devicetype"),
+    )
+
+    texts = {}
+    for i, field in enumerate((
+        "type_displayname", "displayname", "type_description", "description"
+    )):
+        for j, length in enumerate(("short", "long")):
+            for lang, text in ((entry.get(field) or {}).get(length) or {}).items():
+                texts.setdefault(lang, [None] * 8)[2 * i + j] = text
+    for lang, t in texts.items():
+        source.set_displaynames(False, *t, lang=lang)
+
+    for k, v in (entry.get("meta") or {}).items():
+        source.meta[k] = v
+    if "unit" in entry:
+        set_unit(source, entry["name"], str(entry["unit"] or ""), entry.get("type") or "float")
+    for child in children:
+        manifest_source(child, sourcetypes, source)
+    return source
+
 def parse_interactive():
 
-    print()
-    print(
+    say()
+    say(
         "########################" + \
         f"{COLOR_MAGENTA_BOLD} New {SourceType.DEFAULT_SUPER_TYPE} " + \
         f"{COLOR_RESET}########################"
     )
-    name = input(
+    name = ask(
         f"Enter {SourceType.DEFAULT_SUPER_TYPE} type {COLOR_CYAN}" + \
         f"name{COLOR_RESET} (empty to finish): "
     ).strip()
@@ -360,14 +514,14 @@ def parse_interactive():
     the_source = Source(SourceType())
 
     disable_index = False
-    index = input(
+    index = ask(
         f"Enter the source {COLOR_CYAN}index{COLOR_RESET}" + \
         f"('-' to skip, [{the_source.index}]): "
     ).strip()
     if index == "-":
         index = ""
         disable_index = True
-    devtype = input(
+    devtype = ask(
         f"Enter {COLOR_CYAN}device-type{COLOR_RESET} " + \
         "(empty means autogenerate): "
     ).strip()
@@ -379,9 +533,9 @@ def parse_interactive():
         devtype,
     )
 
-    print(f"--- {COLOR_CYAN}Display Names{COLOR_RESET} ---")
+    say(f"--- {COLOR_CYAN}Display Names{COLOR_RESET} ---")
     dlangs = []
-    tdlangs = input(
+    tdlangs = ask(
         "Enter the languages you plan to support " + \
         "(separated by ';', empty to skip all display names): "
     ).split(";")
@@ -389,36 +543,36 @@ def parse_interactive():
         dlangs.append(l.strip())
     for l in dlangs:
         disable_dn = False
-        print(
+        say(
             f"_Language:_{COLOR_YELLOW_BOLD}{l}{COLOR_RESET}_"
         )
-        typedisplns = input(
+        typedisplns = ask(
             f"Enter short sourcetype display name: "
         ).strip()
-        typedisplnl = input(
+        typedisplnl = ask(
             f"Enter long sourcetype display name: "
         ).strip()
         if the_source.index:
             tmps = f"{typedisplns} {the_source.index}"
             tmpl = f"{typedisplnl} {the_source.index}"
-        tmpi = input(
+        tmpi = ask(
             f"Enter source display name ([{tmps}]): "
         ).strip()
         srcdisplns = tmpi if tmpi else tmps
-        tmpi = input(
+        tmpi = ask(
             f"Enter source display name ([{tmpl}]): "
         ).strip()
         srcdisplnl = tmpi if tmpi else tmpl
-        typettips = input(
+        typettips = ask(
             "Enter short description for sourcetype (empty to skip []): "
         )
-        typettipl = input(
+        typettipl = ask(
             "Enter long description for sourcetype (empty to skip []): "
         )
-        srcttips = input(
+        srcttips = ask(
             f"Enter short description for source ([{typettips}]): "
         ) or typettips
-        srcttipl = input(
+        srcttipl = ask(
             f"Enter long description for source ([{typettipl}]): "
         ) or typettipl
         the_source.set_displaynames(
@@ -434,23 +588,23 @@ def parse_interactive():
             lang=l,
         )
 
-    print(f"--- {COLOR_CYAN}UUID{COLOR_RESET} ---")
-    tmpuuid = str(uuid.uuid4())
-    the_source.sourcetype.uuid = input(
+    say(f"--- {COLOR_CYAN}UUID{COLOR_RESET} ---")
+    tmpuuid = new_uuid()
+    the_source.sourcetype.uuid = ask(
         f"Enter sourcetype UUID (['{tmpuuid}']): "
     ).strip() or tmpuuid
-    tmpuuid = str(uuid.uuid4())
-    the_source.uuid = input(
+    tmpuuid = new_uuid()
+    the_source.uuid = ask(
         f"Enter source UUID (['{tmpuuid}']): "
     ).strip() or tmpuuid
 
     subcount = 0
     while True:
-        print("")
-        print(
+        say("")
+        say(
             f"======================= {COLOR_MAGENTA}{name}::{subcount} " + \
             f"{COLOR_RESET}===========================")
-        sub_name = input(
+        sub_name = ask(
             f"Enter sub-sensor {COLOR_CYAN}name{COLOR_RESET} " + \
             f"(empty to end this {SourceType.DEFAULT_SUPER_TYPE}): "
         ).strip()
@@ -462,15 +616,15 @@ def parse_interactive():
         the_child = Source(SourceType())
 
         # names
-        sub_index = input(
+        sub_index = ask(
             f"Enter the sub-sensor {COLOR_CYAN}index{COLOR_RESET} (['']) "
         ).strip()
         sub_dis_index = False if sub_index else True
-        sub_class = input(
+        sub_class = ask(
             f"Enter a {COLOR_CYAN}class name{COLOR_RESET} " + \
             f"(['{SourceType.DEFAULT_SUB_TYPE}']): "
         ).strip() or SourceType.DEFAULT_SUB_TYPE
-        sub_dev_type = input(
+        sub_dev_type = ask(
             f"Enter {COLOR_CYAN}device-type{COLOR_RESET} " + \
             "(empty means autogenerate): "
         ).strip()
@@ -480,14 +634,14 @@ def parse_interactive():
         )
 
         for l in dlangs:
-            print(
+            say(
                 f"--- {COLOR_CYAN}Display Names " + \
                 f"{COLOR_YELLOW_BOLD}{l}{COLOR_RESET} ---"
             )
-            sub_tdisplnames = input(
+            sub_tdisplnames = ask(
                 f"Enter short sourcetype display name ([{sub_name}] if empty): "
             ).strip() or sub_name
-            sub_tdisplnamel = input(
+            sub_tdisplnamel = ask(
                 f"Enter long sourcetype display name ([{sub_name}] if empty): "
             ).strip() or sub_name
             if sub_index:
@@ -499,22 +653,22 @@ def parse_interactive():
             else:
                 ishort = sub_tdisplnames
                 ilong = sub_tdisplnamel
-            sub_sdisplnames = input(
+            sub_sdisplnames = ask(
                 f"Enter short source display name ([{ishort}]): "
             ).strip() or ishort
-            sub_sdisplnamel = input(
+            sub_sdisplnamel = ask(
                 f"Enter long source display name ([{ilong}]): "
             ).strip() or ilong
-            sub_tttips = input(
+            sub_tttips = ask(
                 "Enter short sourcetype description ([]): "
             )
-            sub_tttipl = input(
+            sub_tttipl = ask(
                 "Enter long sourcetype description ([]): "
             )
-            sub_sttips = input(
+            sub_sttips = ask(
                 f"Enter short source description ([{sub_tttips}]): "
             ) or sub_tttips
-            sub_sttipl = input(
+            sub_sttipl = ask(
                 f"Enter long source description ([{sub_tttipl}]): "
             ) or sub_tttipl
             the_child.set_displaynames(
@@ -530,56 +684,58 @@ def parse_interactive():
                 l
             )
 
-        print(
+        say(
             f"--- {COLOR_CYAN}UUID{COLOR_RESET} ---"
         )
-        tmpuuid = str(uuid.uuid4())
-        sub_type_uuid = input(
+        tmpuuid = new_uuid()
+        the_child.sourcetype.uuid = ask(
             f"Enter sourcetype UUID (['{tmpuuid}']): "
-        ).strip()
-        tmpuuid = str(uuid.uuid4())
-        sub_source_uuid = input(
+        ).strip() or tmpuuid
+        tmpuuid = new_uuid()
+        the_child.uuid = ask(
             f"Enter source UUID (['{tmpuuid}']): "
-        ).strip()
+        ).strip() or tmpuuid
 
-        print(f"--- {COLOR_CYAN}Unit{COLOR_RESET} ---")
+        say(f"--- {COLOR_CYAN}Unit{COLOR_RESET} ---")
         if ucum_registry:
             qk = search_ucum(sub_name, sub_dev_type)
             the_child.sourcetype.dataunit = qk["default_unit"]
             the_child.sourcetype.meta["quantity_kind"] = qk
             the_child.sourcetype.meta["uncertainty"] = {}
         else:
-            the_child.sourcetype.dataunit = input(
+            the_child.sourcetype.dataunit = ask(
                 f"Enter {COLOR_CYAN}unit{COLOR_RESET} for '{sub_name}' ['m']: "
             ).strip()
 
-        print(f"--- {COLOR_CYAN}Type{COLOR_RESET} ---")
-        the_child.sourcetype.datatype = input(
+        say(f"--- {COLOR_CYAN}Type{COLOR_RESET} ---")
+        the_child.sourcetype.datatype = ask(
             f"Enter type for '{sub_name}' (default float): "
         ).strip() or "float"
 
-        print(f"--- {COLOR_CYAN}Meta{COLOR_RESET} ---")
+        say(f"--- {COLOR_CYAN}Meta{COLOR_RESET} ---")
         for k, v in parse_meta().items():
             the_child.meta[k] = v
-        print()
-        print(f"=== {COLOR_MAGENTA}SourceType{COLOR_RESET} ===")
-        print(yaml.dump(
-            the_child.sourcetype.serialize_parameters(),
-            sort_keys=False,
-            default_flow_style=False,
-            allow_unicode=True,
-            width=80,
-        ))
-        print(f"=== {COLOR_MAGENTA}Source{COLOR_RESET} ===")
-        print(yaml.dump(
-            the_child.serialize_parameters(),
-            sort_keys=False,
-            default_flow_style=False,
-            allow_unicode=True,
-            width=80,
-        ))
-        print("=== --- ===")
-        skipit = input(
+        if echoing():
+            print()
+            import yaml
+            print(f"=== {COLOR_MAGENTA}SourceType{COLOR_RESET} ===")
+            print(yaml.dump(
+                the_child.sourcetype.serialize_parameters(),
+                sort_keys=False,
+                default_flow_style=False,
+                allow_unicode=True,
+                width=80,
+            ))
+            print(f"=== {COLOR_MAGENTA}Source{COLOR_RESET} ===")
+            print(yaml.dump(
+                the_child.serialize_parameters(),
+                sort_keys=False,
+                default_flow_style=False,
+                allow_unicode=True,
+                width=80,
+            ))
+            print("=== --- ===")
+        skipit = ask(
             f"{COLOR_CYAN_BOLD}Please confirm the entry{COLOR_RESET} " + \
             f"(parent is set automatically [Y/n]): "
         ).strip()
@@ -594,13 +750,13 @@ def parse_meta(level=0):
     hasMeta = True
     while hasMeta:
         if not meta:
-            m = input(
+            m = ask(
                 f"Enter {COLOR_WHITE_BOLD}meta JSON Level{level}" + \
                 f"{COLOR_RESET} (empty to skip, a " + \
                 f"{COLOR_CYAN}key{COLOR_RESET} or JSON): "
             ).strip()
         else:
-            m = input(
+            m = ask(
                 f"Enter {COLOR_WHITE_BOLD}meta JSON Level{level}" + \
                 f"{COLOR_RESET} (empty to skip or the next " + \
                 f"{COLOR_CYAN}key{COLOR_RESET}): "
@@ -610,20 +766,21 @@ def parse_meta(level=0):
         elif m.startswith("{") or m.startswith("["):
             if not meta:
                 try:
+                    import json
                     m = json.loads(m)
                 except:
-                    input(
+                    ask(
                         f"{COLOR_RED_BOLD}WARNING/ERROR: Unable to " + \
                         f"parse JSON, please try again..{COLOR_RESET}"
                     )
                 return m
             else:
-                input(
+                ask(
                     f"{COLOR_RED_BOLD}WARNING/ERROR: JSON found " + \
                     f"but meta not empty, please try again..{COLOR_RESET}"
                 )
         else:
-            v = input(
+            v = ask(
                 f"Now enter the {COLOR_CYAN}value{COLOR_RESET} " + \
                 f"for '{COLOR_WHITE_BOLD}{m}{COLOR_RESET}' or " + \
                 f"leave empty to add {COLOR_CYAN}sub-dict{COLOR_RESET}: "
@@ -681,35 +838,120 @@ def quote_textlike(obj, depth=None):
 
 def main():
 
-    if not sys.stdin.isatty():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Generate Basin Sources/SourceTypes (interactively, from " + \
+        "stdin or from a fleet manifest)."
+    )
+    parser.add_argument("-m", "--manifest", metavar="FILE",
+        help="build all stations of this fleet manifest " + \
+        "(see maestro-fleet-synth.py) instead of asking")
+    parser.add_argument("--schema",
+        help="validate every Source/SourceType against this json/yaml " + \
+        "schema before emitting anything")
+    parser.add_argument("--schema-store", action="append", default=[],
+        help="local schema store (file or directory) the schema's $refs " + \
+        "resolve against (repeatable)")
+    parser.add_argument("--profile", action="store_true",
+        help="print per-stage timers and counters to stderr " + \
+        "(same as MAESTRO_PROFILE=1)")
+    parser.add_argument("--profile-dump", metavar="FILE",
+        help="additionally write a cProfile/pstats dump to FILE " + \
+        "(same as MAESTRO_PROFILE_DUMP=FILE)")
+    parser.add_argument("-o", "--output", metavar="FILE",
+        help="also write the Sources/SourceTypes to FILE as one YAML " + \
+        "document (loadable with source_index.SourceIndex.from_file)")
+    parser.add_argument("--record", metavar="FILE",
+        help="record the answers of this interactive session to FILE")
+    parser.add_argument("--replay", metavar="FILE",
+        help="answer all prompts from FILE (see --record) instead of stdin")
+    parser.add_argument("--params", metavar="FILE",
+        help="with --replay: replay FILE once per parameter set in this " + \
+        "YAML list/CSV file, filling in its $placeholders")
+    args = parser.parse_args()
+    if args.params and not args.replay:
+        parser.error("--params requires --replay")
+    if args.manifest and (args.replay or args.record):
+        parser.error("--manifest cannot be combined with --replay/--record")
+    if args.record and args.replay:
+        parser.error("--record cannot be combined with --replay")
+    if args.record and not sys.stdin.isatty():
+        parser.error("--record needs an interactive session, stdin is not a terminal")
+
+    if args.profile or args.profile_dump:
+        profiler.enable(args.profile_dump)
+    try:
+        _main(args)
+    finally:
+        ucum_parser = sys.modules.get("ucum_parser")
+        if ucum_parser is not None:
+            # the LRU caches know their hits, report them with the others
+            profiler.count(
+                "cache_hits.ucum_parse",
+                ucum_parser.parse_unit.cache_info().hits + \
+                ucum_parser.try_parse_unit.cache_info().hits,
+            )
+        profiler.finish()
+
+def _main(args):
+
+    if args.schema:
+        global source_validators
+        source_validators = load_source_validators(args.schema, args.schema_store)
+
+    global answer_source
+    if args.replay:
+        from answer_file import AnswerReplayer
+        answer_source = AnswerReplayer.from_file(args.replay, args.params)
+    elif args.record:
+        from answer_file import AnswerRecorder
+        answer_source = AnswerRecorder(args.record)
+
+    global ucum_registry
+    if args.manifest:
+        ucum_registry = LazyUnitsRegistry()
+        stations = load_manifest(args.manifest)
+
+        def parse():
+            try:
+                return next(stations, None)
+            except Exception as e:
+                sys.exit(str(e))
+    elif not args.replay and not sys.stdin.isatty():
+        ucum_registry = LazyUnitsRegistry()
         parse = parse_stdin
     else:
-        print(
+        say(
             "########################################" + \
             "########################################"
         )
-        print(
+        say(
             COLOR_GREEN_BOLD + \
             f"                             W e l c o m e !" + \
             COLOR_RESET
         )
-        print(
+        say(
             "########################################" + \
             "########################################"
         )
-        p = os.path.dirname(os.path.realpath(__file__)) + \
-            '/maestro-basin-source-gen.ucum.yaml'
-        pi = input(
+        from units_registry_loader import default_registry_paths
+        p = os.pathsep.join(default_registry_paths())
+        pi = ask(
             "Enter path to " + COLOR_CYAN + \
-            "units/meta " + COLOR_RESET + f"file ([{p}]): "
+            "units/meta " + COLOR_RESET + f"files or directories " + \
+            f"(separated by '{os.pathsep}', later ones override) ([{p}]): "
         ).strip()
-        p = pi if pi else p
-        global ucum_registry
-        ucum_registry = get_units_registry()
+        ucum_registry = LazyUnitsRegistry(
+            [x.strip() for x in pi.split(os.pathsep) if x.strip()] if pi else None
+        )
 
         parse = parse_interactive
 
     sensor_libs = []
+    if answer_source is not None:
+        answer_source.end_setup()
+
+    import yaml
 
     # quote stringlike
     def quoted_representer(dumper, data):
@@ -718,11 +960,16 @@ def main():
 
     do_continue = True
     while do_continue:
-        a_source = parse()
+        try:
+            a_source = parse()
+        except EOFError as e:
+            sys.exit(f"ERROR: {e}")
         if not a_source:
             do_continue = False
         else:
             sensor_libs.append(a_source)
+    if args.record:
+        answer_source.save()
 
     # from here on, replace `None` resp. `null` with ``
     def none_representer(dumper, _):
@@ -734,8 +981,28 @@ def main():
         "sourcetypes": {},
     }
 
-    for l in sensor_libs:
-        l.serialize_deep(container)
+    try:
+        with profiler.stage("serialize_deep"):
+            for l in sensor_libs:
+                l.serialize_deep(container)
+    except Exception as e:
+        sys.exit(str(e))
+
+    if args.output:
+        with profiler.stage("yaml.dump"):
+            with open(args.output, "w", encoding="utf-8") as f:
+                yaml.dump(
+                    {
+                        "sources": list(container["sources"].values()),
+                        "sourcetypes": list(container["sourcetypes"].values()),
+                    },
+                    f,
+                    sort_keys=False,
+                    default_flow_style=False,
+                    allow_unicode=True,
+                    width=80,
+                )
+                profiler.count("bytes.emitted", f.tell())
 
     if "sources" in container and "sourcetypes" in container:
 
@@ -743,29 +1010,36 @@ def main():
             f"\n--- {COLOR_YELLOW}YAML output for " + \
             f"{COLOR_YELLOW_BOLD}'Sources'{COLOR_RESET} ---"
         )
-        source_yaml = yaml.dump(
-            list(container["sources"].values()),
-            sort_keys=False,
-            default_flow_style=False,
-            allow_unicode=True,
-            width=80,
+        with profiler.stage("yaml.dump"):
+            source_yaml = yaml.dump(
+                list(container["sources"].values()),
+                sort_keys=False,
+                default_flow_style=False,
+                allow_unicode=True,
+                width=80,
+            )
+        source_yaml = "".join(
+            Source.LEADING_SPACES + line for line in source_yaml.splitlines(True)
         )
-        print("".join(Source.LEADING_SPACES + line for line in source_yaml.splitlines(True)))
+        profiler.count("bytes.emitted", len(source_yaml.encode("utf-8")))
+        print(source_yaml)
         print(
             f"\n--- {COLOR_YELLOW}YAML output for " + \
             f"{COLOR_YELLOW_BOLD}'SourceTypes'{COLOR_RESET} ---"
         )
-        sourcetypes_yaml = yaml.dump(
-            list(container["sourcetypes"].values()),
-            sort_keys=False,
-            default_flow_style=False,
-            allow_unicode=True,
-            width=80,
-        )
-        print(
-            "".join(SourceType.LEADING_SPACES +
-            line for line in sourcetypes_yaml.splitlines(True))
+        with profiler.stage("yaml.dump"):
+            sourcetypes_yaml = yaml.dump(
+                list(container["sourcetypes"].values()),
+                sort_keys=False,
+                default_flow_style=False,
+                allow_unicode=True,
+                width=80,
+            )
+        sourcetypes_yaml = "".join(
+            SourceType.LEADING_SPACES + line for line in sourcetypes_yaml.splitlines(True)
         )
+        profiler.count("bytes.emitted", len(sourcetypes_yaml.encode("utf-8")))
+        print(sourcetypes_yaml)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+
+# usage: ./maestro-fleet-synth.py [--seed 0] [--stations 100] [--subs 8] \
+#            [--depth 1] [--langs 1] [--meta-keys 0] [-o fleet.yaml]
+#
+# Writes a synthetic fleet manifest for load testing the source pipeline:
+#
+#   ./maestro-fleet-synth.py --stations 5000 --depth 3 --langs 3 -o fleet.yaml
+#   ./maestro-basin-source-gen.py --manifest fleet.yaml --profile > /dev/null
+#
+# Channel names, units and labels are drawn from the units registry (by
+# default the bundled maestro-basin-source-gen.ucum.yaml). The same seed,
+# options and registry always give the same manifest, uuids included, so
+# benchmarks of different commits run on identical data.
+
+import argparse
+import random
+import re
+import sys
+import uuid
+
+from units_registry_loader import UnitsRegistry, default_registry_paths
+
+
+VENDORS = (
+    "WittBoy", "Ecowitt", "Davis", "Vaisala", "Lufft",
+    "Campbell", "Hach", "YSI", "Sontek", "Aanderaa",
+)
+LANGS = ("en", "de", "fr", "it", "es", "nl", "pt", "pl", "sv", "da", "fi", "cs")
+# names of the grouping levels between a station and its channels
+GROUP_LEVELS = ("bus", "module", "port", "slot", "bank")
+META_WORDS = (
+    "north", "south", "east", "west", "roof", "mast", "inlet", "outlet",
+    "basin", "probe", "shaft", "weir", "tank", "pump", "field", "lab",
+)
+
+
+def slug(s):
+    return re.sub(r"[^A-Za-z0-9_]+", "_", s).strip("_")
+
+
+class FleetSynth:
+    """Deterministic manifest generator, all randomness comes from `seed`."""
+
+    def __init__(self, registry, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.langs = LANGS[:max(1, args.langs)]
+        self.vocabulary = self._vocabulary(registry)
+        self.unknown_units = sorted({
+            f"x{self.rng.randrange(10 ** 4):04d}" for _ in range(32)
+        })
+
+        # zipf-like popularity of the quantity kinds (s=0: uniform)
+        ranked = list(range(len(self.vocabulary)))
+        self.rng.shuffle(ranked)
+        weights = [0.0] * len(ranked)
+        for rank, i in enumerate(ranked):
+            weights[i] = 1.0 / (rank + 1) ** args.zipf
+        self.cum_weights = []
+        total = 0.0
+        for w in weights:
+            total += w
+            self.cum_weights.append(total)
+
+    @staticmethod
+    def _vocabulary(registry):
+        vocabulary = []
+        for key, qk in registry.quantity_kinds.items():
+            unit = qk.default_unit
+            info = registry.units.get(unit) or {}
+            spellings = [unit] + [
+                str(s) for s in [info.get("symbol")] + list(info.get("aliases", []) or [])
+                if s and str(s) != unit
+            ]
+            names = [slug(a) for a in qk.aliases if slug(a)] or [slug(key)]
+            vocabulary.append((qk, names, spellings))
+        if not vocabulary:
+            sys.exit("ERROR: the registry has no quantity kinds")
+        return vocabulary
+
+    def uuid(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def texts(self, short, long):
+        return {
+            "short": {l: short if l == "en" else f"{short} ({l})" for l in self.langs},
+            "long": {l: long if l == "en" else f"{long} ({l})" for l in self.langs},
+        }
+
+    def meta(self):
+        meta = {}
+        for i in range(self.args.meta_keys):
+            r = self.rng.random()
+            if r < 0.4:
+                v = self.rng.choice(META_WORDS)
+            elif r < 0.7:
+                v = self.rng.randrange(10 ** 4)
+            elif r < 0.9:
+                v = round(self.rng.uniform(-100, 100), 3)
+            else:
+                v = {"min": self.rng.randrange(-50, 0), "max": self.rng.randrange(1, 50)}
+            meta[f"{self.rng.choice(META_WORDS)}_{i}"] = v
+        return meta
+
+    # --- models: the channel layout and sourcetypes shared by stations ---
+
+    def channel(self):
+        qk, names, spellings = self.rng.choices(self.vocabulary, cum_weights=self.cum_weights)[0]
+        r = self.rng.random()
+        if r < self.args.unknown_units:
+            unit = self.rng.choice(self.unknown_units)
+        elif self.args.unit_style == "canonical":
+            unit = spellings[0]
+        elif self.args.unit_style == "alias" or self.rng.random() < 0.5:
+            unit = self.rng.choice(spellings)
+        else:
+            unit = spellings[0]
+        return {
+            "name": self.rng.choice(names),
+            "unit": unit,
+            "type": "int" if self.rng.random() < 0.05 else "float",
+            "typeuuid": self.uuid(),
+            "label": qk.label,
+        }
+
+    def model(self, n):
+        vendor = self.rng.choice(VENDORS)
+        name = f"{vendor}_{chr(65 + n % 26)}{self.rng.randrange(100, 10000)}"
+        model = {"name": name, "typeuuid": self.uuid(), "children": []}
+
+        # groups down to depth-1, channels spread round robin over the leaves
+        leaves = [model]
+        for level in range(self.args.depth - 1):
+            next_leaves = []
+            for parent in leaves:
+                for g in range(self.args.groups):
+                    group = {
+                        "name": GROUP_LEVELS[level % len(GROUP_LEVELS)],
+                        "index": f"{g + 1:02d}",
+                        "typeuuid": self.uuid(),
+                        "children": [],
+                    }
+                    parent["children"].append(group)
+                    next_leaves.append(group)
+            leaves = next_leaves
+        for i in range(self.args.subs):
+            leaf = leaves[i % len(leaves)]
+            ch = self.channel()
+            taken = sum(c["name"] == ch["name"] for c in leaf["children"])
+            if taken:
+                ch["index"] = f"{taken + 1:02d}"
+            leaf["children"].append(ch)
+        return model
+
+    # --- stations: instances of a model ---
+
+    def instance(self, node, index, own_index=None):
+        label = node.get("label") or node["name"].replace("_", " ")
+        entry = {"name": node["name"]}
+        if own_index or "index" in node:
+            entry["index"] = own_index or node["index"]
+        entry["uuid"] = self.uuid()
+        entry["typeuuid"] = node["typeuuid"]
+        entry["type_displayname"] = self.texts(label, label)
+        entry["displayname"] = self.texts(f"{label} {index}", f"{label} {index}")
+        if "unit" in node:
+            entry["unit"] = node["unit"]
+            entry["type"] = node["type"]
+            entry["type_description"] = self.texts(
+                f"{label} in {node['unit']}", f"{label} in {node['unit']}"
+            )
+            entry["description"] = self.texts(
+                f"{label} in {node['unit']}", f"{label} in {node['unit']}"
+            )
+        meta = self.meta()
+        if meta:
+            entry["meta"] = meta
+        if node.get("children"):
+            entry["children"] = [self.instance(c, index) for c in node["children"]]
+        return entry
+
+    def manifest(self):
+        models = [self.model(n) for n in range(max(1, self.args.models))]
+        stations = []
+        for i in range(self.args.stations):
+            index = f"{i + 1:04d}"
+            stations.append(self.instance(models[i % len(models)], index, index))
+        return {"stations": stations}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write a deterministic synthetic fleet manifest " + \
+        "(input of maestro-basin-source-gen.py --manifest)."
+    )
+    parser.add_argument("-r", "--registry", action="append", default=[],
+        help="registry file or directory to draw the vocabulary from " + \
+        "(repeatable, default: $MAESTRO_UNITS_REGISTRY or the bundled YAML)")
+    parser.add_argument("-o", "--output", metavar="FILE",
+        help="write the manifest to FILE ([stdout])")
+    parser.add_argument("--seed", type=int, default=0, help="random seed ([0])")
+    parser.add_argument("--stations", type=int, default=100,
+        help="number of stations ([100])")
+    parser.add_argument("--models", type=int, default=10,
+        help="distinct station models, stations of one model share " + \
+        "their SourceTypes ([10])")
+    parser.add_argument("--subs", type=int, default=8,
+        help="channels (sub-sensors) per station ([8])")
+    parser.add_argument("--depth", type=int, default=1,
+        help="levels below a station, >1 adds grouping levels ([1])")
+    parser.add_argument("--groups", type=int, default=2,
+        help="with --depth >1: groups per node and level ([2])")
+    parser.add_argument("--langs", type=int, default=1,
+        help=f"display name languages, at most {len(LANGS)} ([1])")
+    parser.add_argument("--meta-keys", type=int, default=0,
+        help="extra meta entries per node ([0])")
+    parser.add_argument("--zipf", type=float, default=1.0,
+        help="skew of the quantity kind popularity, 0 is uniform ([1.0])")
+    parser.add_argument("--unit-style", choices=("canonical", "alias", "mixed"),
+        default="mixed", help="unit spellings: registry key, any symbol/alias, " + \
+        "or half and half ([mixed])")
+    parser.add_argument("--unknown-units", type=float, default=0.02, metavar="RATIO",
+        help="share of channels with a unit unknown to the registry ([0.02])")
+    args = parser.parse_args()
+    if args.depth < 1 or args.groups < 1 or args.subs < 0 or args.stations < 0:
+        parser.error("--depth/--groups must be >0, --subs/--stations >=0")
+
+    registry = UnitsRegistry(args.registry or default_registry_paths())
+    manifest = FleetSynth(registry, args).manifest()
+
+    import yaml
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        yaml.dump(
+            manifest,
+            out,
+            Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+            sort_keys=False,
+            default_flow_style=False,
+            allow_unicode=True,
+            width=80,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.output:
+        groups = sum(args.groups ** l for l in range(1, args.depth))
+        n = args.stations * (1 + groups + args.subs)
+        print(f"{args.stations} stations, {n} sources written to {args.output}",
+            file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("_profiler", "_name", "_t0")
+
+    def __init__(self, profiler: "PipelineProfiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self._profiler._add_time(self._name, time.perf_counter() - self._t0)
+        return False
+
+
+class PipelineProfiler:
+    """
+    Opt-in per-stage timers and counters.
+
+    Disabled (the default) `stage()` hands out a shared no-op context
+    manager and `count()` returns right away, so the hooks can stay in
+    hot paths.
+    """
+
+    def __init__(self, enabled: bool = False, dump: str | None = None) -> None:
+        self.enabled = False
+        self._dump: str | None = None
+        self._cprofile = None
+        self._times: dict[str, float] = {}
+        self._calls: dict[str, int] = {}
+        self._counters: dict[str, int] = {}
+        if enabled:
+            self.enable(dump)
+
+    # --- public API ---
+
+    def enable(self, dump: str | None = None) -> None:
+        """Start collecting, `dump` additionally writes a cProfile/pstats file."""
+        self.enabled = True
+        if dump and self._cprofile is None:
+            import cProfile
+
+            self._dump = dump
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if not self.enabled:
+            return
+        self._counters[name] = self._counters.get(name, 0) + n
+
+    def finish(self, out=None) -> None:
+        """Stop collecting, write the pstats dump (if any) and print the summary."""
+        if not self.enabled:
+            return
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self._dump)
+        self.report(out)
+        self.enabled = False
+
+    def report(self, out=None) -> None:
+        out = out or sys.stderr
+        rows: list[str] = []
+        if self._times:
+            w = max(len(n) for n in self._times)
+            rows.append(f"{'stage':<{w}} {'calls':>9} {'total ms':>11} {'mean us':>11}")
+            for name, total in sorted(self._times.items(), key=lambda kv: -kv[1]):
+                calls = self._calls[name]
+                rows.append(
+                    f"{name:<{w}} {calls:>9} {total * 1e3:>11.3f} " + \
+                    f"{total * 1e6 / calls:>11.1f}"
+                )
+        if self._counters:
+            w = max(len(n) for n in self._counters)
+            rows.append("")
+            rows.append(f"{'counter':<{w}} {'value':>12}")
+            for name, value in sorted(self._counters.items()):
+                rows.append(f"{name:<{w}} {value:>12}")
+        if self._dump:
+            rows.append("")
+            rows.append(f"cProfile stats written to {self._dump}")
+        print("--- profile ---", file=out)
+        print("\n".join(rows), file=out)
+
+    # --- internals ---
+
+    def _add_time(self, name: str, dt: float) -> None:
+        self._times[name] = self._times.get(name, 0.0) + dt
+        self._calls[name] = self._calls.get(name, 0) + 1
+
+
+# --- tiny singleton, switched on by MAESTRO_PROFILE=1 (or --profile) ---
+
+profiler = PipelineProfiler(
+    enabled=os.environ.get("MAESTRO_PROFILE", "") not in ("", "0"),
+    dump=os.environ.get("MAESTRO_PROFILE_DUMP") or None,
+)
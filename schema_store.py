@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+
+
+SCHEMA_SUFFIXES = (".json", ".yaml", ".yml")
+
+
+class SchemaStoreError(Exception):
+    pass
+
+
+def load_schema_file(path: Path):
+    """Quietly read a JSON (or YAML) document."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        return json.loads(text)
+    import yaml
+    return yaml.safe_load(text)
+
+
+class SchemaStore:
+    """
+    Offline `$ref` resolution against a local directory of schemas.
+
+    The directory is scanned once; every document is parsed once and
+    indexed by its `$id` (or draft-4 `id`). All validators built from
+    the same store share the parsed documents, so a batch of data files
+    never re-reads or re-parses a referenced sub-schema. Any `$ref`
+    that does not resolve to an indexed `$id` is an error - the network
+    is never touched.
+    """
+
+    def __init__(self, paths: Path | str | Iterable[Path | str] | None = None) -> None:
+        self._schemas: dict = {}
+        self._files: dict[str, Path] = {}
+        self._registry = None
+        if paths is None:
+            return
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+        for p in paths:
+            self.scan(Path(p))
+
+    # --- public API ---
+
+    @property
+    def schemas(self) -> dict:
+        return self._schemas
+
+    def scan(self, path: Path) -> None:
+        """Index a schema file or every schema file below a directory."""
+        if path.is_dir():
+            files = sorted(
+                p for p in path.rglob("*")
+                if p.is_file() and p.suffix in SCHEMA_SUFFIXES
+            )
+        else:
+            files = [path]
+        for f in files:
+            try:
+                doc = load_schema_file(f)
+            except Exception as e:
+                raise SchemaStoreError(f"Could not read schema {f}: {e}")
+            self.add(doc, f)
+
+    def add(self, schema, origin: Path | None = None) -> str | None:
+        """Index one parsed schema by its `$id`, returns the id (if any)."""
+        if not isinstance(schema, dict):
+            return None
+        sid = schema.get("$id") or schema.get("id")
+        if not sid:
+            return None
+        sid = sid.rstrip("#")
+        if sid in self._files and origin and self._files[sid] != origin:
+            raise SchemaStoreError(
+                f"Duplicate $id '{sid}' in {self._files[sid]} and {origin}"
+            )
+        self._schemas[sid] = schema
+        if origin:
+            self._files[sid] = origin
+        self._registry = None
+        return sid
+
+    def validator_for(self, schema, validator_class=None):
+        """Compile a validator whose `$ref`s resolve against this store."""
+        from jsonschema import Draft7Validator
+
+        cls = validator_class or Draft7Validator
+        try:
+            from referencing import Resource  # jsonschema >= 4.18
+            from referencing.jsonschema import DRAFT7
+        except ImportError:
+            return cls(schema, resolver=self._ref_resolver(schema))
+
+        # the store is crawled once, the root schema only joins this
+        # validator's view of it (it may share an `$id` with a sibling)
+        registry = self._referencing_registry()
+        sid = isinstance(schema, dict) and (schema.get("$id") or schema.get("id"))
+        if sid and self._schemas.get(sid.rstrip("#")) is not schema:
+            registry = registry.with_resource(
+                sid.rstrip("#"),
+                Resource.from_contents(schema, default_specification=DRAFT7),
+            )
+        return cls(schema, registry=registry)
+
+    # --- resolution backends ---
+
+    def _refuse(self, uri: str):
+        raise SchemaStoreError(
+            f"Unresolvable $ref '{uri}': not found in the local schema store"
+        )
+
+    def _referencing_registry(self):
+        if self._registry is None:
+            from referencing import Registry, Resource
+            from referencing.jsonschema import DRAFT7
+
+            def retrieve(uri: str):
+                self._refuse(uri)
+
+            self._registry = Registry(retrieve=retrieve).with_resources(
+                (sid, Resource.from_contents(doc, default_specification=DRAFT7))
+                for sid, doc in self._schemas.items()
+            ).crawl()
+        return self._registry
+
+    def _ref_resolver(self, schema):
+        from jsonschema import RefResolver
+
+        base_uri = ""
+        if isinstance(schema, dict):
+            base_uri = schema.get("$id") or schema.get("id") or ""
+        handlers = {scheme: self._refuse for scheme in ("http", "https", "file", "")}
+        return RefResolver(
+            base_uri, schema, store=self._schemas, handlers=handlers
+        )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from pathlib import Path
+
+
+class SourceIndex:
+    """
+    Hierarchy index over serialized Sources (see Source.serialize_deep).
+
+    Built once in O(n): uuid -> node, sourcetype uuid -> sources, the
+    parent and depth of every node and an Euler tour numbering
+    (tin/tout). A subtree is then a contiguous slice of the tour,
+    ancestry is two integer comparisons and "sources of type Y under X"
+    is a bisect in the sorted tour positions of type Y. Root paths are
+    walked up the parent links on demand, not stored per node.
+    """
+
+    def __init__(self, sources: Iterable[dict], sourcetypes: Iterable[dict] = ()) -> None:
+        self._nodes: dict[str, dict] = {}
+        self._sourcetypes: dict[str, dict] = {}
+        self._children: dict[str, list[str]] = {}
+        self._roots: list[str] = []
+        self._order: list[str] = []              # Euler tour (pre-order)
+        self._tin: dict[str, int] = {}
+        self._tout: dict[str, int] = {}          # exclusive end of the subtree
+        self._parent: dict[str, str | None] = {}  # in the tree, cycles broken
+        self._depth: dict[str, int] = {}
+        self._by_type: dict[str, list[int]] = {}  # typeuuid -> sorted tin
+
+        for st in sourcetypes:
+            self._sourcetypes[st["uuid"]] = st
+        for s in sources:
+            self._nodes[s["uuid"]] = s
+        self._build()
+
+    @classmethod
+    def from_container(cls, container: dict) -> "SourceIndex":
+        """From a serialize_deep container (or its list form, see --output)."""
+        sources = container.get("sources") or []
+        sourcetypes = container.get("sourcetypes") or []
+        if isinstance(sources, dict):
+            sources = sources.values()
+        if isinstance(sourcetypes, dict):
+            sourcetypes = sourcetypes.values()
+        return cls(sources, sourcetypes)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "SourceIndex":
+        """From a YAML/JSON file as written by `maestro-basin-source-gen.py --output`."""
+        import yaml
+
+        with Path(path).open("r", encoding="utf-8") as f:
+            data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        return cls.from_container(data or {})
+
+    # --- public API ---
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, uuid: str) -> bool:
+        return uuid in self._nodes
+
+    @property
+    def roots(self) -> list[str]:
+        return self._roots
+
+    def node(self, uuid: str) -> dict:
+        return self._nodes[uuid]
+
+    def sourcetype(self, uuid: str) -> dict | None:
+        """The SourceType of a source."""
+        return self._sourcetypes.get(self._nodes[uuid].get("typeuuid"))
+
+    def parent(self, uuid: str) -> str | None:
+        return self._parent[uuid]
+
+    def children(self, uuid: str) -> list[str]:
+        return self._children.get(uuid, [])
+
+    def path(self, uuid: str) -> tuple[str, ...]:
+        """The uuids from the root down to (and including) `uuid`."""
+        path = [uuid]
+        parent = self._parent[uuid]
+        while parent is not None:
+            path.append(parent)
+            parent = self._parent[parent]
+        return tuple(reversed(path))
+
+    def depth(self, uuid: str) -> int:
+        return self._depth[uuid]
+
+    def is_ancestor(self, ancestor: str, uuid: str) -> bool:
+        """True if `uuid` lies in the subtree of `ancestor` (or is it)."""
+        t = self._tin[uuid]
+        return self._tin[ancestor] <= t < self._tout[ancestor]
+
+    def subtree_size(self, uuid: str) -> int:
+        return self._tout[uuid] - self._tin[uuid]
+
+    def subtree(self, uuid: str, include_self: bool = True) -> list[str]:
+        start = self._tin[uuid] + (0 if include_self else 1)
+        return self._order[start:self._tout[uuid]]
+
+    def sources_of_type(self, typeuuid: str, under: str | None = None) -> list[str]:
+        """All sources of a SourceType, optionally only those below `under`."""
+        tins = self._by_type.get(typeuuid, [])
+        if under is not None:
+            lo = bisect_left(tins, self._tin[under])
+            hi = bisect_left(tins, self._tout[under], lo)
+            tins = tins[lo:hi]
+        return [self._order[t] for t in tins]
+
+    def count_of_type(self, typeuuid: str, under: str | None = None) -> int:
+        tins = self._by_type.get(typeuuid, [])
+        if under is None:
+            return len(tins)
+        return bisect_right(tins, self._tout[under] - 1) - bisect_left(tins, self._tin[under])
+
+    # --- building ---
+
+    def _build(self) -> None:
+        for uuid, s in self._nodes.items():
+            parent = s.get("parentuuid")
+            if parent and parent in self._nodes and parent != uuid:
+                self._children.setdefault(parent, []).append(uuid)
+            else:
+                self._roots.append(uuid)
+
+        for root in self._roots:
+            self._visit(root)
+        # parent cycles have no root, break them up at their first node
+        for uuid in self._nodes:
+            if uuid not in self._tin:
+                self._roots.append(uuid)
+                self._visit(uuid)
+
+        for uuid in self._order:
+            typeuuid = self._nodes[uuid].get("typeuuid")
+            if typeuuid:
+                self._by_type.setdefault(typeuuid, []).append(self._tin[uuid])
+
+    def _visit(self, root: str) -> None:
+        # iterative DFS, children in serialization order
+        self._parent[root] = None
+        self._depth[root] = 0
+        stack = [(root, False)]
+        while stack:
+            uuid, done = stack.pop()
+            if done:
+                self._tout[uuid] = len(self._order)
+                continue
+            self._tin[uuid] = len(self._order)
+            self._order.append(uuid)
+            stack.append((uuid, True))
+            depth = self._depth[uuid] + 1
+            for child in reversed(self._children.get(uuid, [])):
+                if child in self._tin:
+                    continue  # cycle
+                self._parent[child] = uuid
+                self._depth[child] = depth
+                stack.append((child, False))
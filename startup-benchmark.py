@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# usage: ./startup-benchmark.py [--budget-ms MS] [--runs 5] [script.py ...]
+#
+# Measures the import cost of a real, short invocation of each CLI entry
+# point (see INVOCATIONS) using `python -X importtime`, including what
+# their code paths import lazily, and fails if any of them exceeds the
+# budget. The interpreter's own startup imports are measured separately
+# and subtracted. Bytecode goes to a private pycache prefix and a warm-up
+# run fills it, so compiling the sources is not counted.
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.realpath(__file__))
+
+DEFAULT_SCRIPTS = [
+    "maestro-basin-source-gen.py",
+    "json-schema-validator.py",
+]
+DEFAULT_BUDGET_MS = 20.0
+
+# what a provisioning hook typically runs: (arguments, stdin, budget ms).
+# A station with a unit needs the units registry (~25 ms: dataclasses
+# with inspect ~10, pathlib, hashlib, fractions, the UCUM tables), yaml
+# for the output (~13 ms) and argparse with re (~12 ms), about 57 ms in
+# all; the rest of the generator budget is headroom for a busy machine.
+INVOCATIONS = {
+    "maestro-basin-source-gen.py": (
+        [], "WittBoy_GW2000A\n0000\n   humidityin %RH float\n", 80.0,
+    ),
+    "json-schema-validator.py": (["--help"], None, 20.0),
+}
+DEFAULT_INVOCATION = (["--help"], None, DEFAULT_BUDGET_MS)
+
+def import_times(path, pycache):
+    """Run one invocation, return {top-level module: cumulative us}."""
+    argv, stdin, _ = INVOCATIONS.get(os.path.basename(path), DEFAULT_INVOCATION)
+    cmd = [sys.executable, "-X", "importtime", "-X", f"pycache_prefix={pycache}"]
+    cmd += [path, *argv] if path else ["-c", "pass"]
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    p = subprocess.run(
+        cmd, input=stdin or "", capture_output=True, text=True, cwd=HERE, env=env,
+    )
+    if p.returncode != 0:
+        sys.exit(f"Running {path or 'python'} failed:\n{p.stderr}")
+    times = {}
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        # nested imports are indented below their importer
+        if name.startswith("  ") or not cumulative_us.strip().isdigit():
+            continue
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+def best_of(path, runs, pycache):
+    import_times(path, pycache)  # warm-up, writes the bytecode
+    # fastest time per module over all runs, single noisy runs don't count
+    best = {}
+    for _ in range(runs):
+        for name, us in import_times(path, pycache).items():
+            best[name] = min(us, best.get(name, us))
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import-time startup benchmark for real invocations " + \
+        "of the CLI entry points."
+    )
+    parser.add_argument("scripts", nargs="*", default=DEFAULT_SCRIPTS)
+    parser.add_argument("--budget-ms", type=float,
+        help="maximal import time per invocation (default: per script, " + \
+        f"see INVOCATIONS, else [{DEFAULT_BUDGET_MS}])")
+    parser.add_argument("--runs", type=int, default=5,
+        help="best of N runs, per module ([5])")
+    parser.add_argument("--top", type=int, default=5,
+        help="show the N heaviest imports per script ([5])")
+    args = parser.parse_args()
+
+    pycache = tempfile.mkdtemp(prefix="startup-benchmark-")
+    baseline = best_of("", args.runs, pycache)
+    failed = False
+    for script in args.scripts:
+        path = os.path.join(HERE, script)
+        times = best_of(path, args.runs, pycache)
+        own = {n: us for n, us in times.items() if n not in baseline}
+        total_ms = sum(own.values()) / 1000
+        budget_ms = args.budget_ms or INVOCATIONS.get(
+            os.path.basename(script), DEFAULT_INVOCATION
+        )[2]
+        status = "ok" if total_ms <= budget_ms else "OVER BUDGET"
+        failed = failed or total_ms > budget_ms
+        print(f"{script}: {total_ms:.1f} ms (budget {budget_ms:.1f} ms) {status}")
+        for name, us in sorted(own.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"    {us / 1000:8.2f} ms  {name}")
+    import shutil
+    shutil.rmtree(pycache, ignore_errors=True)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
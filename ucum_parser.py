@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+
+
+# order of the dimension exponents (UCUM base units)
+BASE_DIMENSIONS = ("L", "M", "T", "A", "K", "Q", "J")  # m g s rad K C cd
+
+DIMENSIONLESS: tuple[int, ...] = (0,) * len(BASE_DIMENSIONS)
+
+
+class UcumSyntaxError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ParsedUnit:
+    expression: str                 # the (pre-normalized) input
+    dimension: tuple[int, ...]      # exponents, see BASE_DIMENSIONS
+    scale: Fraction                 # value_in_base = value * scale + offset
+    offset: Fraction
+    arbitrary: bool                 # arbitrary units only compare to themselves
+    terms: tuple[tuple[str, str, int], ...]  # (prefix, atom, exponent)
+
+
+@dataclass(frozen=True)
+class _Atom:
+    dimension: tuple[int, ...]
+    scale: Fraction
+    offset: Fraction = Fraction(0)
+    metric: bool = True             # may carry a prefix
+    arbitrary: bool = False
+
+
+def _dim(**exponents: int) -> tuple[int, ...]:
+    return tuple(exponents.get(d, 0) for d in BASE_DIMENSIONS)
+
+
+PREFIXES: dict[str, Fraction] = {
+    "Y": Fraction(10) ** 24, "Z": Fraction(10) ** 21, "E": Fraction(10) ** 18,
+    "P": Fraction(10) ** 15, "T": Fraction(10) ** 12, "G": Fraction(10) ** 9,
+    "M": Fraction(10) ** 6, "k": Fraction(10) ** 3, "h": Fraction(10) ** 2,
+    "da": Fraction(10), "d": Fraction(1, 10), "c": Fraction(1, 10 ** 2),
+    "m": Fraction(1, 10 ** 3), "u": Fraction(1, 10 ** 6), "n": Fraction(1, 10 ** 9),
+    "p": Fraction(1, 10 ** 12), "f": Fraction(1, 10 ** 15), "a": Fraction(1, 10 ** 18),
+    "z": Fraction(1, 10 ** 21), "y": Fraction(1, 10 ** 24),
+}
+
+_K = Fraction(1000)  # 1 kg in the base unit g
+
+ATOMS: dict[str, _Atom] = {
+    # base units
+    "m": _Atom(_dim(L=1), Fraction(1)),
+    "g": _Atom(_dim(M=1), Fraction(1)),
+    "s": _Atom(_dim(T=1), Fraction(1)),
+    "rad": _Atom(_dim(A=1), Fraction(1)),
+    "K": _Atom(_dim(K=1), Fraction(1)),
+    "C": _Atom(_dim(Q=1), Fraction(1)),
+    "cd": _Atom(_dim(J=1), Fraction(1)),
+    # derived SI units
+    "sr": _Atom(_dim(A=2), Fraction(1)),
+    "Hz": _Atom(_dim(T=-1), Fraction(1)),
+    "N": _Atom(_dim(M=1, L=1, T=-2), _K),
+    "Pa": _Atom(_dim(M=1, L=-1, T=-2), _K),
+    "J": _Atom(_dim(M=1, L=2, T=-2), _K),
+    "W": _Atom(_dim(M=1, L=2, T=-3), _K),
+    "A": _Atom(_dim(Q=1, T=-1), Fraction(1)),
+    "V": _Atom(_dim(M=1, L=2, T=-2, Q=-1), _K),
+    "Ohm": _Atom(_dim(M=1, L=2, T=-1, Q=-2), _K),
+    "S": _Atom(_dim(M=-1, L=-2, T=1, Q=2), 1 / _K),
+    "F": _Atom(_dim(M=-1, L=-2, T=2, Q=2), 1 / _K),
+    "mol": _Atom(DIMENSIONLESS, Fraction("6.02214076e23")),
+    "l": _Atom(_dim(L=3), Fraction(1, 1000)),
+    "L": _Atom(_dim(L=3), Fraction(1, 1000)),
+    "t": _Atom(_dim(M=1), Fraction(10) ** 6),
+    "bar": _Atom(_dim(M=1, L=-1, T=-2), Fraction(10) ** 8),
+    # non-metric units
+    "min": _Atom(_dim(T=1), Fraction(60), metric=False),
+    "h": _Atom(_dim(T=1), Fraction(3600), metric=False),
+    "d": _Atom(_dim(T=1), Fraction(86400), metric=False),
+    "deg": _Atom(_dim(A=1), Fraction(math.pi) / 180, metric=False),
+    "%": _Atom(DIMENSIONLESS, Fraction(1, 100), metric=False),
+    "[ppth]": _Atom(DIMENSIONLESS, Fraction(1, 10 ** 3), metric=False),
+    "[ppm]": _Atom(DIMENSIONLESS, Fraction(1, 10 ** 6), metric=False),
+    "[ppb]": _Atom(DIMENSIONLESS, Fraction(1, 10 ** 9), metric=False),
+    "[in_i]": _Atom(_dim(L=1), Fraction("0.0254"), metric=False),
+    "[ft_i]": _Atom(_dim(L=1), Fraction("0.3048"), metric=False),
+    "[mi_i]": _Atom(_dim(L=1), Fraction("1609.344"), metric=False),
+    # special units (with an offset, never combined with others)
+    "Cel": _Atom(_dim(K=1), Fraction(1), Fraction("273.15"), metric=False),
+    "[degF]": _Atom(_dim(K=1), Fraction(5, 9), Fraction(45967, 180), metric=False),
+    # arbitrary units
+    "[pH]": _Atom(DIMENSIONLESS, Fraction(1), metric=False, arbitrary=True),
+}
+
+# common spellings that are not UCUM codes
+ATOM_ALIASES: dict[str, str] = {
+    "ppm": "[ppm]",
+    "ppb": "[ppb]",
+    "degF": "[degF]",
+    "degC": "Cel",
+    "in": "[in_i]",
+    "ft": "[ft_i]",
+    "pH": "[pH]",
+}
+
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺", "0123456789-+")
+
+_REPLACEMENTS = (
+    ("°C", "Cel"),
+    ("°F", "[degF]"),
+    ("°", "deg"),
+    ("µ", "u"),
+    ("μ", "u"),
+    ("·", "."),
+)
+
+# "10*3"/"10^3" is UCUM's power of ten; any other '*' is an informal
+# multiplication ("kg*m") and any other '^' an informal exponent ("m^2")
+_INFORMAL_OPERATORS = re.compile(r"(?<![0-9])(10)[*^](?=[+-]?[0-9])|([*^])")
+
+
+def _informal_operator(m: "re.Match[str]") -> str:
+    if m.group(1):
+        return "10*"
+    return "." if m.group(2) == "*" else ""
+
+
+def _prenormalize(expression: str) -> str:
+    s = expression.strip().translate(_SUPERSCRIPTS)
+    for a, b in _REPLACEMENTS:
+        s = s.replace(a, b)
+    s = _INFORMAL_OPERATORS.sub(_informal_operator, s)
+    return " ".join(s.split()).replace(" ", ".")
+
+
+class _Parser:
+    """Recursive descent over the UCUM grammar (case sensitive)."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+        self.terms: list[tuple[str, str, int]] = []
+        self.special: _Atom | None = None
+        self.arbitrary = False
+        self.combined = False           # any factor or unit seen yet
+
+    def parse(self) -> tuple[tuple[int, ...], Fraction]:
+        if not self.text:
+            raise UcumSyntaxError("Empty unit expression")
+        dim, scale = self.term()
+        if self.pos != len(self.text):
+            self.fail("unexpected character")
+        return dim, scale
+
+    def fail(self, msg: str):
+        raise UcumSyntaxError(
+            f"Invalid unit '{self.text}' at position {self.pos}: {msg}"
+        )
+
+    def peek(self) -> str:
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    # term := '/' component | component (('.' | '/') component)*
+    def term(self) -> tuple[tuple[int, ...], Fraction]:
+        if self.peek() == "/":
+            self.pos += 1
+            self.combined = True        # "/Cel" is no offset unit either
+            dim, scale = self.component()
+            dim, scale = _power(dim, scale, -1)
+        else:
+            dim, scale = self.component()
+        while self.peek() in (".", "/"):
+            op = self.peek()
+            self.pos += 1
+            d, s = self.component()
+            if op == "/":
+                d, s = _power(d, s, -1)
+            dim = tuple(a + b for a, b in zip(dim, d))
+            scale *= s
+        return dim, scale
+
+    # component := '(' term ')' | annotation | factor | annotatable annotation?
+    def component(self) -> tuple[tuple[int, ...], Fraction]:
+        c = self.peek()
+        if c == "(":
+            self.pos += 1
+            result = self.term()
+            if self.peek() != ")":
+                self.fail("missing ')'")
+            self.pos += 1
+            return result
+        if c == "{":
+            self.annotation()
+            return DIMENSIONLESS, Fraction(1)
+        if c.isdigit():
+            if self.special is not None:
+                self.fail("special units cannot be combined")
+            self.combined = True
+            factor = self.digits()
+            if factor == 10 and self.peek() == "*":
+                # 10*n: power of ten
+                self.pos += 1
+                return DIMENSIONLESS, Fraction(10) ** self.exponent()
+            return DIMENSIONLESS, Fraction(factor)
+        result = self.annotatable()
+        if self.peek() == "{":
+            self.annotation()
+        return result
+
+    def annotation(self) -> None:
+        end = self.text.find("}", self.pos)
+        if end < 0:
+            self.fail("missing '}'")
+        self.pos = end + 1
+
+    def exponent(self) -> int:
+        c = self.peek()
+        sign = -1 if c == "-" else 1
+        if c in ("+", "-"):
+            self.pos += 1
+        if not self.peek().isdigit():
+            self.fail("exponent expected")
+        return sign * self.digits()
+
+    def digits(self) -> int:
+        start = self.pos
+        while self.peek().isdigit():
+            self.pos += 1
+        return int(self.text[start:self.pos])
+
+    # annotatable := simple_unit exponent?
+    def annotatable(self) -> tuple[tuple[int, ...], Fraction]:
+        start = self.pos
+        while True:
+            c = self.peek()
+            if c == "[":
+                end = self.text.find("]", self.pos)
+                if end < 0:
+                    self.fail("missing ']'")
+                self.pos = end + 1
+            elif c and (c.isalpha() or c in "%_'"):
+                self.pos += 1
+            else:
+                break
+        symbol = self.text[start:self.pos]
+        if not symbol:
+            self.fail("unit symbol expected")
+
+        exponent = 1
+        c = self.peek()
+        if c and (c in "+-" or c.isdigit()):
+            exponent = self.exponent()
+
+        prefix, name, atom = self.simple_unit(symbol)
+        if atom.offset or self.special is not None:
+            if self.combined or exponent != 1 or prefix:
+                self.fail("special units cannot be combined")
+            self.special = atom
+        self.combined = True
+        self.arbitrary = self.arbitrary or atom.arbitrary
+        self.terms.append((prefix, name, exponent))
+        scale = atom.scale * (PREFIXES[prefix] if prefix else 1)
+        return _power(atom.dimension, scale, exponent)
+
+    def simple_unit(self, symbol: str) -> tuple[str, str, _Atom]:
+        symbol = ATOM_ALIASES.get(symbol, symbol)
+        if symbol in ATOMS:
+            return "", symbol, ATOMS[symbol]
+        for plen in (2, 1):
+            prefix, rest = symbol[:plen], symbol[plen:]
+            rest = ATOM_ALIASES.get(rest, rest)
+            if prefix in PREFIXES and rest in ATOMS and ATOMS[rest].metric:
+                return prefix, rest, ATOMS[rest]
+        self.fail(f"unknown unit '{symbol}'")
+
+
+def _power(dim: tuple[int, ...], scale: Fraction, exponent: int) -> tuple[tuple[int, ...], Fraction]:
+    return tuple(d * exponent for d in dim), scale ** exponent
+
+
+@lru_cache(maxsize=4096)
+def parse_unit(expression: str) -> ParsedUnit:
+    """
+    Parse a UCUM (or common informal) unit expression into its dimension
+    vector and scale, e.g. "kg/m3", "W.m-2", "mm/h", "µg/m³" or "hPa".
+
+    Results are memoized, raises UcumSyntaxError for invalid expressions.
+    """
+    p = _Parser(_prenormalize(expression))
+    dim, scale = p.parse()
+    offset = p.special.offset if p.special is not None else Fraction(0)
+    return ParsedUnit(
+        expression=p.text,
+        dimension=dim,
+        scale=scale,
+        offset=offset,
+        arbitrary=p.arbitrary,
+        terms=tuple(p.terms),
+    )
+
+
+@lru_cache(maxsize=4096)
+def try_parse_unit(expression: str | None) -> ParsedUnit | None:
+    """parse_unit, but None for invalid expressions (memoized as well)."""
+    if not expression:
+        return None
+    try:
+        return parse_unit(expression)
+    except UcumSyntaxError:
+        return None
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+# usage: ./units-registry-tool.py [-r registry ...] warm VOCABULARY [-k 10]
+#        ./units-registry-tool.py [-r registry ...] check [--strict] [--terms N]
+#
+# Maintenance tasks for the units registry (maestro-basin-source-gen.ucum.yaml
+# and its overlays):
+#
+#   warm   precompute the top-k quantity kinds for a vocabulary of known
+#          queries (device channel names), one per line or a YAML list
+#   check  report the diagnostics of the registry compile step (ambiguous
+#          aliases, dangling default units, broad tags) and the least
+#          selective terms; exits 1 on errors (with --strict: on warnings)
+
+import argparse
+import sys
+
+from units_registry_loader import UnitsRegistry, default_registry_paths, registry_cache_dir
+
+
+def read_vocabulary(path):
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            return [str(q) for q in yaml.safe_load(f) or []]
+        return [
+            l.strip() for l in f
+            if l.strip() and not l.lstrip().startswith("#")
+        ]
+
+def warm(registry, args):
+    queries = read_vocabulary(args.vocabulary)
+    n = registry.warm(queries, args.k)
+    if registry_cache_dir() is None:
+        print("WARNING: the registry cache is disabled, nothing was stored")
+    print(f"{n} queries precomputed (top {args.k}), fingerprint {registry.fingerprint}")
+
+def check(registry, args):
+    for d in registry.diagnostics:
+        print(f"{d.severity.upper()}: [{d.code}] {d.message}")
+    if args.terms:
+        print(f"\nLeast selective terms (of {len(registry.quantity_kinds)} quantity kinds):")
+        for t in registry.term_stats[:args.terms]:
+            print(
+                f"  {t.selectivity:6.1%}  {len(t.quantity_kinds):4d}  " + \
+                f"{t.kind:5s}  {t.term}" + ("  (exact only)" if t.broad else "")
+            )
+    errors = sum(d.severity == "error" for d in registry.diagnostics)
+    warnings = len(registry.diagnostics) - errors
+    print(f"\n{errors} error(s), {warnings} warning(s) in {len(registry.shards)} shard(s)")
+    if errors or (args.strict and warnings):
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Maintenance tasks for the units registry."
+    )
+    parser.add_argument("-r", "--registry", action="append", default=[],
+        help="registry file or directory, later ones override " + \
+        "(repeatable, default: $MAESTRO_UNITS_REGISTRY or the bundled YAML)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("warm", help="precompute top-k lookups for a vocabulary")
+    p.add_argument("vocabulary", help="file with one query per line (or a YAML list)")
+    p.add_argument("-k", type=int, default=10, help="results kept per query ([10])")
+    p.set_defaults(func=warm)
+
+    p = sub.add_parser("check", help="validate the registry, show term selectivity")
+    p.add_argument("--strict", action="store_true", help="fail on warnings too")
+    p.add_argument("--terms", type=int, default=10, metavar="N",
+        help="show the N least selective aliases/tags ([10], 0 for none)")
+    p.set_defaults(func=check)
+
+    args = parser.parse_args()
+    registry = UnitsRegistry(args.registry or default_registry_paths())
+    args.func(registry, args)
+
+if __name__ == "__main__":
+    main()
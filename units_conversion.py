@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import array
+
+from units_registry_loader import UnitsRegistry, get_units_registry
+
+
+class IncompatibleUnitsError(ValueError):
+    pass
+
+
+def _numpy():
+    """NumPy is optional, it is only used to vectorize the bulk conversions."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class UnitConverter:
+    """
+    Conversions between the units of a `UnitsRegistry`.
+
+    All units sharing a dimension vector are converted via the precomputed
+    table `(src, dst) -> (a, b)` with `dst_value = src_value * a + b`, so a
+    bulk conversion is a single multiply-add over the whole buffer.
+    Units missing from the registry are parsed as UCUM expressions.
+    Arbitrary units (pH, FNU, ...) only "convert" to themselves.
+    """
+
+    def __init__(self, registry: UnitsRegistry) -> None:
+        self._registry = registry
+        self._table: dict[tuple[str, str], tuple[float, float]] = {}
+        self._build()
+
+    # --- public API ---
+
+    @property
+    def table(self) -> dict[tuple[str, str], tuple[float, float]]:
+        return self._table
+
+    def compatible(self, src: str, dst: str) -> bool:
+        try:
+            self.factors(src, dst)
+        except IncompatibleUnitsError:
+            return False
+        return True
+
+    def factors(self, src: str, dst: str) -> tuple[float, float]:
+        """Return `(a, b)` such that `dst_value = src_value * a + b`."""
+        s = self._registry.normalize_unit(src)
+        d = self._registry.normalize_unit(dst)
+        if s is not None and d is not None:
+            try:
+                return self._table[(s, d)]
+            except KeyError:
+                raise IncompatibleUnitsError(
+                    f"Cannot convert '{src}' to '{dst}'"
+                ) from None
+
+        # not listed in the registry, but maybe a valid UCUM expression
+        si = self._registry.unit_info(src)
+        di = self._registry.unit_info(dst)
+        if si is None or di is None:
+            raise IncompatibleUnitsError(
+                f"Unknown unit: '{src if si is None else dst}'"
+            )
+        if si.key == di.key:
+            return (1.0, 0.0)
+        if si.arbitrary or di.arbitrary or si.dimension != di.dimension:
+            raise IncompatibleUnitsError(f"Cannot convert '{src}' to '{dst}'")
+        return (
+            float(si.scale / di.scale),
+            float((si.offset - di.offset) / di.scale),
+        )
+
+    def convert(self, value: float, src: str, dst: str) -> float:
+        a, b = self.factors(src, dst)
+        return value * a + b
+
+    def convert_many(self, values, src: str, dst: str, out=None):
+        """
+        Convert a whole buffer in one call.
+
+        `values` may be a NumPy array, an `array.array` or any iterable of
+        numbers. NumPy arrays come back as NumPy arrays, `array.array`s as
+        `array.array('d')` and everything else as a list. If given, `out`
+        (a NumPy array or an `array.array` of typecode 'd'/'f' of the same
+        length, possibly `values` itself) receives the result in place.
+        """
+        a, b = self.factors(src, dst)
+        if isinstance(out, array.array) and out.typecode not in "df":
+            raise TypeError(
+                f"out must be an array.array of typecode 'd' or 'f', not '{out.typecode}'"
+            )
+        np = _numpy()
+
+        if np is not None:
+            if isinstance(values, array.array):
+                view = np.frombuffer(values, dtype=values.typecode)
+                if out is None:
+                    out = array.array("d", bytes(8 * len(values)))
+                target = np.frombuffer(out, dtype=out.typecode) \
+                    if isinstance(out, array.array) else out
+                np.multiply(view, a, out=target, casting="unsafe")
+                if b:
+                    np.add(target, b, out=target, casting="unsafe")
+                return out
+            if isinstance(values, np.ndarray):
+                if out is None:
+                    return values * a + b
+                target = np.frombuffer(out, dtype=out.typecode) \
+                    if isinstance(out, array.array) else out
+                np.multiply(values, a, out=target, casting="unsafe")
+                if b:
+                    np.add(target, b, out=target, casting="unsafe")
+                return out
+
+        # pure python fallback, still only one multiply-add per value
+        if a == 1.0 and b == 0.0:
+            result = [float(v) for v in values]
+        elif b == 0.0:
+            result = [v * a for v in values]
+        else:
+            result = [v * a + b for v in values]
+        if out is not None:
+            out[:] = array.array(out.typecode, result) \
+                if isinstance(out, array.array) else result
+            return out
+        if isinstance(values, array.array):
+            return array.array("d", result)
+        return result
+
+    def to_default_unit(self, values, src: str, quantity_kind: str, out=None):
+        """Convert readings into the `default_unit` of a quantity kind."""
+        qk = self._registry.quantity_kinds[quantity_kind]
+        return self.convert_many(values, src, qk.default_unit, out)
+
+    def convertible_units(self, unit: str) -> list[str]:
+        u = self._registry.normalize_unit(unit)
+        return [d for (s, d) in self._table if s == u]
+
+    # --- building ---
+
+    def _build(self) -> None:
+        groups: dict[tuple[int, ...], list[str]] = {}
+        for key, info in self._registry.unit_infos.items():
+            self._table[(key, key)] = (1.0, 0.0)
+            if info.arbitrary:
+                continue
+            groups.setdefault(info.dimension, []).append(key)
+
+        infos = self._registry.unit_infos
+        for keys in groups.values():
+            for s in keys:
+                si = infos[s]
+                for d in keys:
+                    if s == d:
+                        continue
+                    di = infos[d]
+                    # base = v * s.scale + s.offset ; v' = (base - d.offset) / d.scale
+                    self._table[(s, d)] = (
+                        float(si.scale / di.scale),
+                        float((si.offset - di.offset) / di.scale),
+                    )
+
+
+# --- tiny singleton helper ---
+
+_converter: UnitConverter | None = None
+
+
+def get_unit_converter(registry: UnitsRegistry | None = None) -> UnitConverter:
+    global _converter
+    if _converter is None:
+        _converter = UnitConverter(registry or get_units_registry())
+    return _converter
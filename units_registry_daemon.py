@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+
+# usage: ./units_registry_daemon.py [--socket PATH] [registry file/dir ...]
+#
+# Keeps one warm UnitsRegistry and answers lookups over a unix socket.
+# Protocol: one JSON array per line, `[op, arg, ...]`, answered by one
+# JSON object per line, `{"ok": result}` or `{"error": message}`:
+#
+#   ["ping"]                            -> "pong"
+#   ["info"]                            -> {"shards": [path, ...], "fingerprint": ..}
+#   ["normalize", raw_unit]             -> key or null
+#   ["dimension", raw_unit]             -> [exponents] or null
+#   ["lookup", query, raw_unit, limit]  -> [[key, score], ...]
+#   ["kinds"]                           -> {key: quantity kind}
+#   ["batch", [[op, arg, ...], ...]]    -> [{"ok": ..} or {"error": ..}, ...]
+#   ["reload"]                          -> number of shards (see also SIGHUP)
+
+from __future__ import annotations
+
+import os
+import stat
+import sys
+
+from pipeline_profiler import profiler
+
+
+# longest request line the server accepts (a "batch" is a single line)
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+def default_socket_path() -> str:
+    p = os.environ.get("MAESTRO_REGISTRY_SOCKET")
+    if p:
+        return p
+    run_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if run_dir:
+        return os.path.join(run_dir, "maestro-units-registry.sock")
+    return os.path.join(_fallback_dir(), "registry.sock")
+
+
+def _fallback_dir() -> str:
+    # private (0700) and checked before use, see _private_dir
+    return f"/tmp/maestro-units-registry-{os.getuid()}"
+
+
+def _private_dir(path: str) -> None:
+    """Create `path` 0700, or make sure nobody else owns or can write it."""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if (
+        not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or
+        st.st_mode & 0o077
+    ):
+        raise PermissionError(
+            f"{path} must be a directory owned by uid {os.getuid()} with mode 0700"
+        )
+
+
+def _check_peer(sock, path: str) -> None:
+    """Refuse daemons (and socket files) run by another user."""
+    import socket
+    import struct
+
+    uid = os.getuid()
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = sock.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+        )
+        _, peer_uid, _ = struct.unpack("3i", creds)
+    else:
+        peer_uid = os.stat(path).st_uid
+    if peer_uid != uid:
+        raise PermissionError(
+            f"registry daemon on {path} runs as uid {peer_uid}, not {uid}"
+        )
+
+
+# --- server ---
+
+class RegistryService:
+    def __init__(self, registry) -> None:
+        self.registry = registry
+
+    def handle(self, request):
+        if not isinstance(request, list) or not request:
+            raise ValueError("request must be a non-empty JSON array")
+        op, args = request[0], request[1:]
+        if op == "batch":
+            results = []
+            for r in args[0] if args else []:
+                try:
+                    results.append({"ok": self.handle(r)})
+                except Exception as e:
+                    results.append({"error": str(e)})
+            return results
+        if op == "ping":
+            return "pong"
+        if op == "info":
+            return {
+                "shards": [str(p.resolve()) for p in self.registry.shards],
+                "fingerprint": self.registry.fingerprint,
+            }
+        if op == "normalize":
+            return self.registry.normalize_unit(*args)
+        if op == "dimension":
+            dim = self.registry.unit_dimension(*args)
+            return list(dim) if dim is not None else None
+        if op == "lookup":
+            return [list(r) for r in self.registry.lookup_quantity_kinds(*args)]
+        if op == "kinds":
+            return {k: qk.__dict__ for k, qk in self.registry.quantity_kinds.items()}
+        if op == "reload":
+            self.registry.reload()
+            return len(self.registry.shards)
+        raise ValueError(f"unknown op '{op}'")
+
+    async def client_connected(self, reader, writer) -> None:
+        import asyncio
+        import json
+
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial
+                except asyncio.LimitOverrunError:
+                    # skip the rest of the oversized line, keep the client
+                    await _discard_line(reader)
+                    line = None
+                    response = {
+                        "error": f"request longer than {MAX_REQUEST_BYTES} bytes"
+                    }
+                if line is not None:
+                    if not line:
+                        break
+                    try:
+                        response = {"ok": self.handle(json.loads(line))}
+                    except Exception as e:
+                        response = {"error": str(e)}
+                writer.write(
+                    json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n"
+                )
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def _discard_line(reader) -> None:
+    import asyncio
+
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.IncompleteReadError:
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+
+
+def serve(socket_path: str, registry_paths: list[str] | None = None) -> None:
+    import asyncio
+    import signal
+
+    from units_registry_loader import get_units_registry
+
+    if os.path.dirname(os.path.abspath(socket_path)) == _fallback_dir():
+        try:
+            _private_dir(os.path.dirname(socket_path))
+        except OSError as e:
+            sys.exit(f"ERROR: {e}")
+    if os.path.exists(socket_path):
+        if ping(socket_path):
+            sys.exit(f"ERROR: a registry daemon is already listening on {socket_path}")
+        os.unlink(socket_path)  # stale
+
+    service = RegistryService(get_units_registry(registry_paths or None))
+
+    async def main() -> None:
+        server = await asyncio.start_unix_server(
+            service.client_connected, path=socket_path, limit=MAX_REQUEST_BYTES
+        )
+        os.chmod(socket_path, 0o600)
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGHUP, service.registry.reload)
+        stop = loop.create_future()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set_result, None)
+        print(
+            f"Serving {len(service.registry.shards)} registry file(s) " + \
+            f"on {socket_path}", file=sys.stderr
+        )
+        async with server:
+            await stop
+
+    try:
+        asyncio.run(main())
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+# --- client ---
+
+class RegistryClient:
+    """
+    Thin blocking client with the lookup API of UnitsRegistry, backed by
+    a running daemon instead of an in-process registry.
+
+    Answers are memoized for the lifetime of the client (a generator run
+    asks the same few units and channel names over and over), `reload()`
+    drops them.
+    """
+
+    def __init__(self, socket_path: str | None = None, timeout: float = 5.0) -> None:
+        # socket and json are imported here, not by every generator run
+        import socket
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        socket_path = socket_path or default_socket_path()
+        try:
+            self._sock.connect(socket_path)
+            _check_peer(self._sock, socket_path)
+        except OSError:
+            self._sock.close()
+            raise
+        self._file = self._sock.makefile("rwb")
+        self._quantity_kinds = None
+        self._memo: dict[tuple, object] = {}
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def call(self, op: str, *args):
+        import json
+
+        self._file.write(
+            json.dumps([op, *args], separators=(",", ":")).encode("utf-8") + b"\n"
+        )
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("registry daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["ok"]
+
+    def cached_call(self, op: str, *args):
+        key = (op, *args)
+        try:
+            result = self._memo[key]
+        except KeyError:
+            pass
+        else:
+            profiler.count("cache_hits.daemon_client")
+            return result
+        result = self._memo[key] = self.call(op, *args)
+        return result
+
+    def batch(self, requests: list[list]) -> list[dict]:
+        """Many lookups in one round trip, e.g. [["normalize", "hPa"], ...]."""
+        return self.call("batch", requests)
+
+    def reload(self) -> None:
+        self.call("reload")
+        self._memo.clear()
+        self._quantity_kinds = None
+
+    # --- UnitsRegistry API ---
+
+    @property
+    def quantity_kinds(self):
+        if self._quantity_kinds is None:
+            from units_registry_loader import QuantityKindInfo
+
+            self._quantity_kinds = {
+                k: QuantityKindInfo(**v) for k, v in self.call("kinds").items()
+            }
+        return self._quantity_kinds
+
+    def normalize_unit(self, raw: str | None) -> str | None:
+        return self.cached_call("normalize", raw)
+
+    def unit_dimension(self, raw: str | None) -> tuple[int, ...] | None:
+        dim = self.cached_call("dimension", raw)
+        return tuple(dim) if dim is not None else None
+
+    def lookup_quantity_kinds(
+        self,
+        query: str,
+        raw_unit: str | None = None,
+        limit: int = 10,
+    ) -> list[tuple[str, int]]:
+        return [
+            tuple(r) for r in self.cached_call("lookup", query, raw_unit, limit)
+        ]
+
+
+def ping(socket_path: str | None = None) -> bool:
+    try:
+        c = RegistryClient(socket_path, timeout=1.0)
+    except OSError:
+        return False
+    try:
+        return c.call("ping") == "pong"
+    except (OSError, ValueError):
+        return False
+    finally:
+        c.close()
+
+
+def _serves_default_registry(info) -> bool:
+    """Whether a daemon's `info` matches default_registry_paths() as of now."""
+    from units_registry_loader import (
+        default_registry_paths, expand_shards, shards_fingerprint,
+    )
+
+    shards = expand_shards(default_registry_paths())
+    try:
+        fingerprint = shards_fingerprint(shards)
+    except OSError:
+        return False
+    return (
+        isinstance(info, dict) and
+        info.get("shards") == [str(p.resolve()) for p in shards] and
+        info.get("fingerprint") == fingerprint
+    )
+
+
+def connect_units_registry(path=None, socket_path: str | None = None):
+    """
+    A client of the running daemon, or - if there is none, it serves
+    other registry files than the default ones (or other versions of
+    them), or specific files are requested - the in-process registry.
+    """
+    socket_path = socket_path or default_socket_path()
+    if (
+        path is None and os.environ.get("MAESTRO_REGISTRY_DAEMON", "1") != "0"
+        and os.path.exists(socket_path)
+    ):
+        try:
+            client = RegistryClient(socket_path)
+        except OSError:
+            client = None
+        if client is not None:
+            try:
+                if _serves_default_registry(client.call("info")):
+                    return client
+                print(
+                    f"WARNING: the registry daemon on {socket_path} serves " + \
+                    "other registry files (or versions), using the in-process registry",
+                    file=sys.stderr,
+                )
+            except (OSError, ValueError):
+                pass
+            client.close()
+    from units_registry_loader import get_units_registry
+
+    return get_units_registry(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Serve a warm units registry over a unix domain socket."
+    )
+    parser.add_argument("registry", nargs="*",
+        help="registry files/directories (default: $MAESTRO_UNITS_REGISTRY " + \
+        "or the bundled YAML)")
+    parser.add_argument("--socket", default=default_socket_path(),
+        help=f"socket path ([{default_socket_path()}])")
+    args = parser.parse_args()
+    serve(args.socket, args.registry)
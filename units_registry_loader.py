@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
+import marshal
+import os
+from collections.abc import Iterable
 from dataclasses import dataclass
+from fractions import Fraction
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
 
-import yaml
+from pipeline_profiler import profiler
+from ucum_parser import BASE_DIMENSIONS, ParsedUnit, try_parse_unit
 
 
 @dataclass(frozen=True)
@@ -14,29 +20,315 @@ class QuantityKindInfo:
     symbol: str           # e.g. "%RH"
     default_unit: str     # e.g. "%"
     uri: str              # QUDT etc.
-    aliases: List[str]
-    tags: List[str]
+    aliases: list[str]
+    tags: list[str]
+
+
+@dataclass(frozen=True)
+class UnitInfo:
+    key: str                        # dict key from YAML (e.g. "hPa")
+    symbol: str                     # e.g. "hPa"
+    dimension: tuple[int, ...]      # exponents, see BASE_DIMENSIONS
+    scale: Fraction                 # value_in_base = value * scale + offset
+    offset: Fraction
+    arbitrary: bool                 # never convertible to other units
+
+
+@dataclass(frozen=True)
+class RegistryDiagnostic:
+    severity: str                   # "error" or "warning"
+    code: str                       # e.g. "ambiguous-alias"
+    subject: str                    # the alias, unit or term concerned
+    keys: tuple[str, ...]           # the registry entries involved
+    message: str
+
+
+@dataclass(frozen=True)
+class TermStats:
+    term: str                       # lowercased alias or tag
+    kind: str                       # "alias" or "tag"
+    quantity_kinds: tuple[str, ...]
+    selectivity: float              # share of all quantity kinds carrying it
+    broad: bool                     # only scored on an exact match
+
+
+@dataclass(frozen=True)
+class _CompiledKind:
+    # lowercased match terms of a QuantityKindInfo, see UnitsRegistry._compile
+    key: str
+    default_unit: str
+    aliases: tuple[str, ...]
+    tags: tuple[str, ...]
+    broad_tags: tuple[str, ...]
+    label_lc: str
+    key_lc: str
+    symbol_lc: str
+
+
+def _signature(dimension: tuple[int, ...], scale: Fraction, offset: Fraction) -> tuple:
+    # 12 significant digits: "deg" is pi/180 in the parser but a decimal in the YAML
+    return (dimension, float(f"{float(scale):.12g}"), float(f"{float(offset):.12g}"))
+
+
+
+REGISTRY_SECTIONS = ("units", "quantity_kinds")
+
+# bump whenever lookup_quantity_kinds scores differently, this invalidates
+# the precomputed top-k tables (see UnitsRegistry.warm)
+SCORING_VERSION = 2
+# tags carried by more than this share of the quantity kinds only score on
+# an exact match, a substring hit on them says nothing about the query
+BROAD_TERM_RATIO = 0.5
+SHARD_SUFFIXES = (".yaml", ".yml")
+
+
+def _query_text(query: str | None) -> str:
+    # the same for warm() and lookups, so precomputed entries are found
+    return (query or "").strip().lower()
+
+
+def registry_cache_dir() -> Path | None:
+    """
+    Where parsed shards are cached between runs: $MAESTRO_REGISTRY_CACHE,
+    else $XDG_CACHE_HOME (~/.cache)/maestro-basin-source-gen. Setting
+    MAESTRO_REGISTRY_CACHE to "" or "0" disables the disk cache.
+    """
+    d = os.environ.get("MAESTRO_REGISTRY_CACHE")
+    if d is not None:
+        return Path(d) if d not in ("", "0") else None
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(base) / "maestro-basin-source-gen"
+
+
+def expand_shards(paths: Path | str | Iterable[Path | str]) -> list[Path]:
+    """
+    The registry files in override order (later ones win): directories
+    contribute their *.yaml/*.yml files sorted by name.
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    shards: list[Path] = []
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            shards.extend(sorted(
+                f for f in p.iterdir()
+                if f.is_file() and f.suffix in SHARD_SUFFIXES
+            ))
+        else:
+            shards.append(p)
+    return shards
+
+
+def shards_fingerprint(shards: list[Path]) -> str:
+    """Identifies a shard set by resolved paths, mtimes and sizes."""
+    return hashlib.sha1(repr((
+        SCORING_VERSION,
+        [(str(p.resolve()), _stamp(p)) for p in shards],
+    )).encode("utf-8")).hexdigest()
+
+
+# in-process shard cache: resolved path -> (stamp, parsed data)
+_shard_cache: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def load_shard(path: Path) -> dict:
+    """
+    Parse one registry shard, unless it is unchanged (mtime/size) since it
+    was last parsed by this process or - via the disk cache - any other.
+    """
+    path = path.resolve()
+    stamp = _stamp(path)
+    cached = _shard_cache.get(path)
+    if cached and cached[0] == stamp:
+        profiler.count("cache_hits.registry_shards")
+        return cached[1]
+
+    cache_dir = registry_cache_dir()
+    cache_file = None
+    if cache_dir is not None:
+        digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()
+        cache_file = cache_dir / f"shard-{digest}.marshal"
+        try:
+            # marshal, not pickle: a cache file can hold data, never code
+            with cache_file.open("rb") as f:
+                c_stamp, c_data = marshal.load(f)
+            if c_stamp == stamp and isinstance(c_data, dict):
+                profiler.count("cache_hits.registry_shards")
+                _shard_cache[path] = (stamp, c_data)
+                return c_data
+        except Exception:
+            pass
+
+    import yaml
+
+    profiler.count("registry.shards_parsed")
+    with path.open("r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"Registry shard {path} is not a mapping")
+    data = {k: data.get(k, {}) or {} for k in REGISTRY_SECTIONS}
+    _shard_cache[path] = (stamp, data)
+
+    if cache_file is not None:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                with tmp.open("wb") as f:
+                    marshal.dump((stamp, data), f)
+                os.replace(tmp, cache_file)
+            finally:
+                tmp.unlink(missing_ok=True)
+        except (OSError, ValueError):
+            # ValueError: YAML types marshal cannot store (e.g. dates)
+            pass
+    return data
 
 
 class UnitsRegistry:
-    def __init__(self, path: Path) -> None:
+    """
+    Units and quantity kinds from one or more YAML files (shards).
+
+    `path` is a file, a directory of shards or a list of both. Entries of
+    later shards replace same-named entries of earlier ones (e.g. a base
+    vocabulary followed by per-domain and per-customer overlays).
+    """
+
+    def __init__(self, path: Path | str | Iterable[Path | str]) -> None:
         self._path = path
-        self._units: Dict[str, Dict[str, Any]] = {}
-        self._quantity_kinds: Dict[str, QuantityKindInfo] = {}
+        self._reset()
         self._load()
 
+    def _reset(self) -> None:
+        self._shards: list[Path] = []
+        self._fingerprint = ""
+        self._topk: dict[str, tuple[int, list[tuple[str, int]]]] = {}
+        self._units: dict[str, dict] = {}
+        self._unit_infos: dict[str, UnitInfo] = {}
+        self._unit_signatures: dict[tuple, str] = {}
+        self._unit_names: dict[str, list[str]] = {}  # lowercased symbol/alias -> keys
+        self._quantity_kinds: dict[str, QuantityKindInfo] = {}
+        self._qk_dimensions: dict[str, tuple[int, ...] | None] = {}
+        self._compiled: list[_CompiledKind] = []
+        self._term_stats: dict[tuple[str, str], TermStats] = {}
+        self._diagnostics: list[RegistryDiagnostic] = []
+
     # --- public API ---
 
     @property
-    def units(self) -> Dict[str, Dict[str, Any]]:
+    def shards(self) -> list[Path]:
+        return self._shards
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the loaded shard contents (paths, mtimes, sizes)."""
+        return self._fingerprint
+
+    def reload(self) -> None:
+        """Pick up changed shards; unchanged ones are not parsed again."""
+        self._load()
+
+    def warm(self, queries: Iterable[str], k: int = 10, save: bool = True) -> int:
+        """
+        Precompute the top-`k` results of `lookup_quantity_kinds` (without
+        unit) for a vocabulary of known queries, e.g. device channel names.
+        The table is stored next to the shard cache and loaded with the
+        registry as long as the shards (and the scoring) stay the same.
+        Returns the number of entries in the table.
+        """
+        for q in queries:
+            text = _query_text(q)
+            if text:
+                self._topk[text] = (k, self._score_quantity_kinds(text, None, k))
+        if save:
+            self._save_topk()
+        return len(self._topk)
+
+    @property
+    def diagnostics(self) -> list[RegistryDiagnostic]:
+        """Problems found when the registry was compiled (see _compile)."""
+        return self._diagnostics
+
+    @property
+    def term_stats(self) -> list[TermStats]:
+        """Selectivity of every alias and tag, least selective first."""
+        return sorted(
+            self._term_stats.values(),
+            key=lambda t: (-t.selectivity, t.kind, t.term),
+        )
+
+    @property
+    def units(self) -> dict[str, dict]:
         return self._units
 
     @property
-    def quantity_kinds(self) -> Dict[str, QuantityKindInfo]:
+    def quantity_kinds(self) -> dict[str, QuantityKindInfo]:
         return self._quantity_kinds
 
-    def normalize_unit(self, raw: Optional[str]) -> Optional[str]:
-        """Map a raw unit string to a canonical key if possible."""
+    @property
+    def unit_infos(self) -> dict[str, UnitInfo]:
+        return self._unit_infos
+
+    def unit_info(self, raw: str | None) -> UnitInfo | None:
+        """
+        Dimension and scale/offset of a (raw) unit string: the registry
+        entry if there is one, else whatever the UCUM parser makes of it.
+        """
+        key = self._match_unit(raw)
+        if key:
+            return self._unit_infos.get(key)
+        parsed = try_parse_unit(raw)
+        if parsed is None:
+            return None
+        key = self._match_parsed(parsed)
+        if key:
+            return self._unit_infos.get(key)
+        return UnitInfo(
+            key=parsed.expression,
+            symbol=raw.strip(),
+            dimension=parsed.dimension,
+            scale=parsed.scale,
+            offset=parsed.offset,
+            arbitrary=parsed.arbitrary,
+        )
+
+    def unit_dimension(self, raw: str | None) -> tuple[int, ...] | None:
+        """The dimension vector of a unit string, None if unknown or arbitrary."""
+        info = self.unit_info(raw)
+        if info is None or info.arbitrary:
+            return None
+        return info.dimension
+
+    def normalize_unit(self, raw: str | None) -> str | None:
+        """
+        Map a raw unit string to a canonical key if possible.
+
+        Strings not listed as key, symbol or alias are parsed as UCUM
+        expressions and matched by dimension and scale ("dm3" -> "L").
+        """
+        key = self._match_unit(raw)
+        if key is None and raw:
+            parsed = try_parse_unit(raw)
+            if parsed is not None:
+                key = self._match_parsed(parsed)
+        return key
+
+    def _match_parsed(self, parsed: ParsedUnit) -> str | None:
+        if parsed.arbitrary:
+            return None
+        return self._unit_signatures.get(
+            _signature(parsed.dimension, parsed.scale, parsed.offset)
+        )
+
+    def _match_unit(self, raw: str | None) -> str | None:
         if raw is None:
             return None
         s = raw.strip()
@@ -47,22 +339,16 @@ class UnitsRegistry:
         if s in self._units:
             return s
 
-        # match by symbol or alias
-        s_lc = s.lower()
-        for key, info in self._units.items():
-            if info.get("symbol", "").lower() == s_lc:
-                return key
-            for a in info.get("aliases", []) or []:
-                if a.lower() == s_lc:
-                    return key
-        return None
+        # match by symbol or alias, the first unit listing it wins
+        keys = self._unit_names.get(s.lower())
+        return keys[0] if keys else None
 
     def lookup_quantity_kinds(
         self,
         query: str,
-        raw_unit: Optional[str] = None,
+        raw_unit: str | None = None,
         limit: int = 10,
-    ) -> List[Tuple[str, int]]:
+    ) -> list[tuple[str, int]]:
         """
         Return a list of (quantity_kind_key, score), sorted by score DESC.
 
@@ -72,67 +358,168 @@ class UnitsRegistry:
           - label/key/symbol substring matches (light)
           - optional unit compatibility bonus
         """
-        text = (query or "").lower()
+        profiler.count("registry.lookups")
+        text = _query_text(query)
+        if not raw_unit and limit and limit > 0:
+            hit = self._topk.get(text)
+            if hit is not None and limit <= hit[0]:
+                profiler.count("cache_hits.registry_topk")
+                return hit[1][:limit]
+        with profiler.stage("registry.lookup_quantity_kinds"):
+            return self._score_quantity_kinds(text, raw_unit, limit)
+
+    def _score_quantity_kinds(
+        self,
+        text: str,
+        raw_unit: str | None,
+        limit: int,
+    ) -> list[tuple[str, int]]:
         norm_unit = self.normalize_unit(raw_unit) if raw_unit else None
+        unit_dim = self.unit_dimension(raw_unit) if raw_unit else None
 
-        results: List[Tuple[str, int]] = []
+        results: list[tuple[str, int]] = []
 
-        for key, qk in self._quantity_kinds.items():
+        for ck in self._compiled:
             score = 0
 
-            # 1) unit compatibility bonus
-            if norm_unit and norm_unit == (qk.default_unit or "").strip():
+            # 1) unit compatibility bonus (same unit, or at least same dimension)
+            if norm_unit and norm_unit == ck.default_unit:
                 score += 4
+            elif unit_dim is not None and unit_dim == self._qk_dimensions[ck.key]:
+                score += 2
 
             # 2) exact alias match
-            for a in qk.aliases:
-                a_lc = a.lower()
+            for a_lc in ck.aliases:
                 if a_lc == text:
                     score += 8
                 elif a_lc in text or text in a_lc:
                     score += 4
 
-            # 3) tag matches
-            for t in qk.tags:
-                t_lc = t.lower()
+            # 3) tag matches, broad tags only count when exact
+            for t_lc in ck.tags:
                 if t_lc == text:
                     score += 5
                 elif t_lc in text or text in t_lc:
                     score += 2
+            if text in ck.broad_tags:
+                score += 5
 
             # 4) label / key / symbol substrings
-            if qk.label.lower() == text:
+            if ck.label_lc == text:
                 score += 5
-            elif text and qk.label.lower() in text or text in qk.label.lower():
+            elif text and ck.label_lc in text or text in ck.label_lc:
                 score += 2
 
-            if qk.key.lower() == text:
+            if ck.key_lc == text:
                 score += 4
-            elif text and (qk.key.lower() in text or text in qk.key.lower()):
+            elif text and (ck.key_lc in text or text in ck.key_lc):
                 score += 1
 
-            if qk.symbol.lower() == text:
+            if ck.symbol_lc == text:
                 score += 3
-            elif text and (qk.symbol.lower() in text or text in qk.symbol.lower()):
+            elif text and (ck.symbol_lc in text or text in ck.symbol_lc):
                 score += 1
 
             if score > 0:
-                results.append((key, score))
+                results.append((ck.key, score))
 
-        results.sort(key=lambda kv: kv[1], reverse=True)
+        # partial selection, same (stable) order as a full sort + slice
         if limit and limit > 0:
-            results = results[:limit]
+            return heapq.nlargest(limit, results, key=lambda kv: kv[1])
+        results.sort(key=lambda kv: kv[1], reverse=True)
         return results
 
     # --- loading ---
 
     def _load(self) -> None:
-        with self._path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-
-        self._units = data.get("units", {}) or {}
-
-        qk_raw: Dict[str, Any] = data.get("quantity_kinds", {}) or {}
+        shards = expand_shards(self._path)
+        if not shards:
+            raise ValueError(f"No registry files found in {self._path}")
+        data: dict[str, dict] = {k: {} for k in REGISTRY_SECTIONS}
+        for shard in shards:
+            for section, entries in load_shard(shard).items():
+                data[section].update(entries)
+
+        # build on a scratch instance and swap in only once all of it
+        # worked: a failing reload() leaves the registry as it was
+        staged = object.__new__(type(self))
+        staged._path = self._path
+        staged._reset()
+        staged._shards = shards
+        staged._index(data)
+        staged._fingerprint = shards_fingerprint(shards)
+        staged._topk = staged._load_topk()
+        self.__dict__.update(staged.__dict__)
+
+    def _topk_prefix(self) -> str:
+        # one table per shard set, the fingerprint tells its versions apart
+        paths = repr([str(p.resolve()) for p in self._shards])
+        return "topk-" + hashlib.sha1(paths.encode("utf-8")).hexdigest()[:16]
+
+    def _topk_file(self) -> Path | None:
+        cache_dir = registry_cache_dir()
+        if cache_dir is None:
+            return None
+        return cache_dir / f"{self._topk_prefix()}-{self._fingerprint}.marshal"
+
+    def _load_topk(self) -> dict[str, tuple[int, list[tuple[str, int]]]]:
+        f = self._topk_file()
+        if f is None or not f.exists():
+            return {}
+        try:
+            # marshal, not pickle: a cache file can hold data, never code
+            with f.open("rb") as fh:
+                table = marshal.load(fh)
+            return {
+                str(text): (int(k), [(str(key), int(score)) for key, score in results])
+                for text, (k, results) in table.items()
+            }
+        except Exception:
+            return {}
+
+    def _save_topk(self) -> None:
+        f = self._topk_file()
+        if f is None:
+            return
+        f.parent.mkdir(parents=True, exist_ok=True)
+        tmp = f.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("wb") as fh:
+            marshal.dump(self._topk, fh)
+        os.replace(tmp, f)
+        # tables of earlier versions of these shards are never read again
+        for old in f.parent.glob(f"{self._topk_prefix()}-*.marshal"):
+            if old != f:
+                old.unlink(missing_ok=True)
+
+    def _index(self, data: dict[str, dict]) -> None:
+        # fills a freshly _reset() instance, see _load
+        self._units = dict(data.get("units", {}) or {})
+        for key, info in self._units.items():
+            dim = info.get("dimension", {}) or {}
+            unknown = set(dim) - set(BASE_DIMENSIONS)
+            if unknown:
+                raise ValueError(
+                    f"Unit '{key}' has unknown dimensions: {sorted(unknown)}"
+                )
+            ui = UnitInfo(
+                key=key,
+                symbol=info.get("symbol", key),
+                dimension=tuple(int(dim.get(d, 0)) for d in BASE_DIMENSIONS),
+                # exact, so chained factors don't accumulate rounding errors
+                scale=Fraction(str(info.get("scale", 1))),
+                offset=Fraction(str(info.get("offset", 0))),
+                arbitrary=bool(info.get("arbitrary", False)),
+            )
+            self._unit_infos[key] = ui
+            if not ui.arbitrary:
+                self._unit_signatures.setdefault(
+                    _signature(ui.dimension, ui.scale, ui.offset), key
+                )
+            names = [info.get("symbol", "")] + list(info.get("aliases", []) or [])
+            for name in dict.fromkeys(str(n).lower() for n in names if n):
+                self._unit_names.setdefault(name, []).append(key)
+
+        qk_raw: dict = data.get("quantity_kinds", {}) or {}
         for key, info in qk_raw.items():
             qk = QuantityKindInfo(
                 key=key,
@@ -144,18 +531,116 @@ class UnitsRegistry:
                 tags=list(info.get("tags", []) or []),
             )
             self._quantity_kinds[key] = qk
+            self._qk_dimensions[key] = self.unit_dimension(qk.default_unit)
+
+        self._compile()
+
+    def _compile(self) -> None:
+        """
+        Precompute the lowercased match terms of every quantity kind, the
+        selectivity of each alias and tag, and the diagnostics: aliases
+        shared by several kinds or units, default units missing from
+        `units` and tags too broad to tell kinds apart.
+        """
+        self._diagnostics = []
+        n_kinds = len(self._quantity_kinds)
+
+        carriers: dict[tuple[str, str], list[str]] = {}
+        for key, qk in self._quantity_kinds.items():
+            for kind, terms in (("alias", qk.aliases), ("tag", qk.tags)):
+                for term in dict.fromkeys(t.lower() for t in terms):
+                    carriers.setdefault((kind, term), []).append(key)
+        self._term_stats = {
+            (kind, term): TermStats(
+                term=term,
+                kind=kind,
+                quantity_kinds=tuple(keys),
+                selectivity=len(keys) / n_kinds,
+                broad=kind == "tag" and len(keys) / n_kinds > BROAD_TERM_RATIO,
+            )
+            for (kind, term), keys in carriers.items()
+        }
+
+        self._compiled = []
+        for key, qk in self._quantity_kinds.items():
+            tags = [t.lower() for t in qk.tags]
+            self._compiled.append(_CompiledKind(
+                key=key,
+                default_unit=qk.default_unit.strip(),
+                aliases=tuple(a.lower() for a in qk.aliases),
+                tags=tuple(t for t in tags if not self._term_stats[("tag", t)].broad),
+                broad_tags=tuple(t for t in tags if self._term_stats[("tag", t)].broad),
+                label_lc=qk.label.lower(),
+                key_lc=qk.key.lower(),
+                symbol_lc=qk.symbol.lower(),
+            ))
+
+        for stats in self._term_stats.values():
+            if stats.kind == "alias" and len(stats.quantity_kinds) > 1:
+                self._report(
+                    "warning", "ambiguous-alias", stats.term, stats.quantity_kinds,
+                    f"alias '{stats.term}' is shared by " + \
+                    ", ".join(stats.quantity_kinds),
+                )
+            elif stats.broad:
+                self._report(
+                    "warning", "broad-tag", stats.term, stats.quantity_kinds,
+                    f"tag '{stats.term}' is on {len(stats.quantity_kinds)} of " + \
+                    f"{n_kinds} quantity kinds, only exact matches score",
+                )
+
+        for name, keys in self._unit_names.items():
+            if len(keys) > 1:
+                self._report(
+                    "warning", "ambiguous-unit", name, tuple(keys),
+                    f"unit symbol/alias '{name}' is shared by " + \
+                    ", ".join(keys) + f", it resolves to '{keys[0]}'",
+                )
+
+        for key, qk in self._quantity_kinds.items():
+            unit = qk.default_unit.strip()
+            if not unit or self._match_unit(unit):
+                continue
+            parsed = try_parse_unit(unit)
+            if parsed is None:
+                self._report(
+                    "error", "dangling-unit", unit, (key,),
+                    f"default unit '{unit}' of '{key}' is neither in " + \
+                    "`units` nor a valid UCUM expression",
+                )
+                continue
+            match = self._match_parsed(parsed)
+            self._report(
+                "warning", "dangling-unit", unit, (key,),
+                f"default unit '{unit}' of '{key}' is not in `units`" + \
+                (f", it resolves to '{match}' via UCUM" if match else ""),
+            )
+
+    def _report(self, severity: str, code: str, subject: str, keys: tuple[str, ...], message: str) -> None:
+        self._diagnostics.append(RegistryDiagnostic(
+            severity=severity, code=code, subject=subject, keys=keys, message=message,
+        ))
 
 
 # --- tiny singleton helper ---
 
-_registry: Optional[UnitsRegistry] = None
+_registry: UnitsRegistry | None = None
+
+
+def default_registry_paths() -> list[str]:
+    """$MAESTRO_UNITS_REGISTRY (os.pathsep separated) or the bundled YAML."""
+    env = os.environ.get("MAESTRO_UNITS_REGISTRY", "")
+    if env:
+        return [p for p in env.split(os.pathsep) if p]
+    return [str(Path(__file__).with_name("maestro-basin-source-gen.ucum.yaml"))]
 
 
-def get_units_registry(path: Optional[Path] = None) -> UnitsRegistry:
+def get_units_registry(path: Path | str | Iterable[Path | str] | None = None) -> UnitsRegistry:
     global _registry
     if _registry is None:
         if path is None:
-            path = Path(__file__).with_name("maestro-basin-source-gen.ucum.yaml")
-        _registry = UnitsRegistry(path)
+            path = default_registry_paths()
+        with profiler.stage("registry.load"):
+            _registry = UnitsRegistry(path)
     return _registry
 